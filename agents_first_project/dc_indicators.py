@@ -0,0 +1,120 @@
+import numpy as np
+import pandas as pd
+
+
+def dc_event_table(prices: pd.Series, dc_events: pd.Series) -> pd.DataFrame:
+    """
+    Builds one row per directional change event from the per-bar output of
+    directional_change.detect_directional_changes.
+
+    Args:
+        prices: The price series the events were detected on.
+        dc_events: 1 / -1 on bars confirming an upward / downward DC, 0 elsewhere.
+
+    Returns:
+        A DataFrame indexed by the confirmation bar's label with columns:
+        direction, extreme_idx / extreme_price (where the DC event started),
+        dc_idx / dc_price (where it was confirmed), os_end_idx / os_end_price
+        (the extreme that ends the overshoot) and complete (False for the last
+        event, whose overshoot is still running).
+    """
+    values = np.asarray(prices, dtype=float)
+    events = np.asarray(dc_events)
+    dc_idx = np.flatnonzero(events != 0)
+    direction = events[dc_idx].astype(int)
+    n_events = len(dc_idx)
+    if n_events == 0:
+        return pd.DataFrame(columns=["direction", "extreme_idx", "extreme_price", "dc_idx", "dc_price",
+                                     "os_end_idx", "os_end_price", "complete"])
+
+    # Segment k covers the bars from the previous confirmation up to (not
+    # including) confirmation k; its extreme is where event k started: the
+    # trough for an upward DC, the peak for a downward one. The tail segment
+    # after the last confirmation holds the running overshoot extreme.
+    bars = np.arange(len(values))
+    segment = np.searchsorted(dc_idx, bars, side="right")
+    segment_direction = np.append(direction, -direction[-1])
+    key = values * segment_direction[segment]
+    order = np.lexsort((key, segment))
+    first = np.searchsorted(segment[order], np.arange(n_events + 1))
+    extreme = order[first]
+
+    os_end = extreme[1:]
+    table = pd.DataFrame({
+        "direction": direction,
+        "extreme_idx": extreme[:-1],
+        "extreme_price": values[extreme[:-1]],
+        "dc_idx": dc_idx,
+        "dc_price": values[dc_idx],
+        "os_end_idx": os_end,
+        "os_end_price": values[os_end],
+        "complete": np.arange(n_events) < n_events - 1,
+    })
+    if isinstance(prices, pd.Series):
+        table.index = prices.index[dc_idx]
+    return table
+
+
+def dc_indicators(table: pd.DataFrame, threshold: float, window: int = 60) -> pd.DataFrame:
+    """
+    Computes the standard intrinsic-time indicators for every event of a DC table.
+
+    Args:
+        table: The output of dc_event_table.
+        threshold: The threshold the events were detected with (e.g. 0.01 for 1%).
+        window: Length in bars of the rolling window used for event frequency.
+
+    Returns:
+        A DataFrame with the same index as `table` and columns:
+        dc_return: log return over the DC phase (extreme to confirmation),
+        overshoot: size of the overshoot as a fraction of the confirmation price,
+        dc_duration / os_duration: lengths of the DC and overshoot phases in bars,
+        tmv: total move from extreme to overshoot end, in units of `threshold`,
+        time_adjusted_return: total move return per bar of the whole event,
+        frequency: DC events confirmed in the last `window` bars.
+    """
+    direction = table["direction"].to_numpy(dtype=float)
+    extreme_price = table["extreme_price"].to_numpy(dtype=float)
+    dc_price = table["dc_price"].to_numpy(dtype=float)
+    os_end_price = table["os_end_price"].to_numpy(dtype=float)
+    extreme_idx = table["extreme_idx"].to_numpy()
+    dc_idx = table["dc_idx"].to_numpy()
+    os_end_idx = table["os_end_idx"].to_numpy()
+
+    total_move = direction * (os_end_price - extreme_price) / extreme_price
+    total_duration = np.maximum(os_end_idx - extreme_idx, 1)
+    in_window = np.searchsorted(dc_idx, dc_idx - window, side="right")
+    return pd.DataFrame({
+        "dc_return": np.log(dc_price / extreme_price),
+        "overshoot": direction * (os_end_price - dc_price) / dc_price,
+        "dc_duration": dc_idx - extreme_idx,
+        "os_duration": os_end_idx - dc_idx,
+        "tmv": total_move / threshold,
+        "time_adjusted_return": total_move / total_duration,
+        "frequency": np.arange(1, len(dc_idx) + 1) - in_window,
+    }, index=table.index)
+
+
+def feature_matrix(prices_by_symbol: dict, threshold: float, window: int = 60,
+                   columns: list = None, complete_only: bool = True) -> pd.DataFrame:
+    """
+    Stacks the DC indicators of many symbols into one (symbol, date)-indexed
+    matrix, ready to be fed to a multi-feature HMM per symbol or pooled.
+
+    Args:
+        prices_by_symbol: Maps each symbol to its price Series.
+        threshold: DC threshold used for every symbol.
+        window: Rolling window for event frequency, in bars.
+        columns: Indicator columns to keep (default: all).
+        complete_only: Drop each symbol's last event, whose overshoot has not ended.
+    """
+    from directional_change import detect_directional_changes
+
+    frames = {}
+    for symbol, prices in prices_by_symbol.items():
+        table = dc_event_table(prices, detect_directional_changes(prices, threshold))
+        features = dc_indicators(table, threshold, window)
+        if complete_only:
+            features = features[table["complete"].to_numpy(dtype=bool)]
+        frames[symbol] = features[columns] if columns else features
+    return pd.concat(frames, names=["symbol", None])
@@ -1,9 +1,6 @@
 
 import pandas as pd
 import numpy as np
-from hmmlearn import hmm
-import matplotlib.pyplot as plt
-from sklearn.model_selection import ParameterGrid
 import os
 
 # Function to detect directional changes
@@ -37,6 +34,8 @@ def detect_directional_changes(prices, threshold):
 
 # Function to train HMM
 def train_hmm(features, n_components=2, n_iter=100):
+    from hmmlearn import hmm
+
     model = hmm.GaussianHMM(n_components=n_components, covariance_type="diag", n_iter=n_iter, random_state=42)
     model.fit(features)
     return model
@@ -54,7 +53,7 @@ def main():
     prices = df['Close'].values
 
     # Grid search for optimal threshold
-    param_grid = {'threshold': np.linspace(0.005, 0.05, 10)} # Thresholds from 0.5% to 5%
+    thresholds = np.linspace(0.005, 0.05, 10) # Thresholds from 0.5% to 5%
     best_score = -np.inf
     best_threshold = None
     best_model = None
@@ -62,8 +61,7 @@ def main():
 
     results = []
 
-    for params in ParameterGrid(param_grid):
-        threshold = params['threshold']
+    for threshold in thresholds:
         print(f"Testing threshold: {threshold:.4f}")
 
         dc_points_df = detect_directional_changes(prices, threshold)
@@ -123,7 +121,9 @@ def main():
 
         hidden_states = best_model.predict(features)
 
-        # Plotting
+        # Plotting; pyplot and its backend are only loaded on this path
+        import matplotlib.pyplot as plt
+
         plt.figure(figsize=(15, 7))
         plt.plot(df.index, prices, label='NIFTY 50 Close Price', alpha=0.7)
 
@@ -2,11 +2,10 @@
 import pandas as pd
 import numpy as np
 import os
-from alpha_vantage.timeseries import TimeSeries
 
-def create_dummy_data(num_days=252 * 10): # 10 years of trading days
+def create_dummy_data(num_days=252 * 10, seed=42): # 10 years of trading days
     """Creates dummy NIFTY 50-like data."""
-    np.random.seed(42)
+    np.random.seed(seed)
     dates = pd.date_range(start='2014-01-01', periods=num_days, freq='B')
     # Simulate a general uptrend with some volatility
     prices = 10000 + np.cumsum(np.random.randn(num_days) * 20 + 5)
@@ -16,26 +15,37 @@ def create_dummy_data(num_days=252 * 10): # 10 years of trading days
     df.set_index('Date', inplace=True)
     return df
 
-def fetch_nifty50_data():
+def fetch_prices(symbol='^NSEI', dummy_seed=42):
     """
-    Fetches NIFTY 50 data using Alpha Vantage API.
+    Fetches daily close prices for `symbol` using Alpha Vantage API.
+    Falls back to dummy data seeded with `dummy_seed` when no API key is set
+    or the request fails.
     """
     api_key = os.getenv('ALPHAVANTAGE_API_KEY')
     if not api_key:
         print("Alpha Vantage API key not found. Using dummy data.")
-        return create_dummy_data()
+        return create_dummy_data(seed=dummy_seed)
 
-    print("Fetching NIFTY 50 data from Alpha Vantage...")
+    from alpha_vantage.timeseries import TimeSeries
+
+    print(f"Fetching {symbol} data from Alpha Vantage...")
     ts = TimeSeries(key=api_key, output_format='pandas')
     try:
-        # Use '^NSEI' for NIFTY 50, 'full' for all available data
-        data, meta_data = ts.get_daily(symbol='^NSEI', outputsize='full')
+        # 'full' for all available data
+        data, meta_data = ts.get_daily(symbol=symbol, outputsize='full')
         # Alpha Vantage returns '4. close' for closing price
         data = data.rename(columns={'4. close': 'Close'})
         return data[['Close']].sort_index() # Ensure chronological order
     except Exception as e:
         print(f"Error fetching data from Alpha Vantage: {e}. Using dummy data.")
-        return create_dummy_data()
+        return create_dummy_data(seed=dummy_seed)
+
+def fetch_nifty50_data():
+    """
+    Fetches NIFTY 50 data using Alpha Vantage API.
+    """
+    # Use '^NSEI' for NIFTY 50
+    return fetch_prices('^NSEI')
 
 def main():
     if not os.path.exists('data'):
@@ -1,8 +1,6 @@
 
 import pandas as pd
 import numpy as np
-from hmmlearn import hmm
-from sklearn.model_selection import ParameterGrid
 from directional_change import detect_directional_changes
 import warnings
 
@@ -25,6 +23,8 @@ def train_and_evaluate_hmm(data: np.ndarray, n_components: int = 2, n_iter: int
     if data.ndim == 1:
         data = data.reshape(-1, 1)
 
+    from hmmlearn import hmm
+
     model = hmm.GaussianHMM(n_components=n_components, covariance_type="full", n_iter=n_iter, random_state=42)
     try:
         model.fit(data)
@@ -46,16 +46,15 @@ def main():
         print(f"An error occurred while loading data: {e}")
         return
 
-    # Define the parameter grid for threshold
-    param_grid = {'threshold': np.arange(0.005, 0.05, 0.005)}  # Thresholds from 0.5% to 4.5% in 0.5% steps
+    # Thresholds to search
+    thresholds = np.arange(0.005, 0.05, 0.005)  # Thresholds from 0.5% to 4.5% in 0.5% steps
     best_threshold = None
     best_log_likelihood = -np.inf
     best_model = None
     best_dc_events_for_best_threshold = None # Store DC events for the best threshold
 
     print("Starting Grid Search for optimal threshold...")
-    for params in ParameterGrid(param_grid):
-        threshold = params['threshold']
+    for threshold in thresholds:
         print(f"Testing threshold: {threshold*100:.2f}%")
 
         # Detect directional changes. dc_events will have the same index as close_prices.
@@ -1,15 +1,25 @@
 import subprocess
 import sys
+from importlib import metadata
 
 def install_packages():
     packages = ["alpha_vantage", "pandas", "python-dotenv", "scikit-learn", "hmmlearn"]
+    missing = []
     for package in packages:
         try:
-            subprocess.check_call([sys.executable, "-m", "pip", "install", package])
-            print(f"Successfully installed {package}")
-        except subprocess.CalledProcessError as e:
-            print(f"Error installing {package}: {e}")
-            sys.exit(1)
+            metadata.version(package)
+        except metadata.PackageNotFoundError:
+            missing.append(package)
+    if not missing:
+        print("All packages are already installed")
+        return
+    # One pip call lets the resolver handle every package together.
+    try:
+        subprocess.check_call([sys.executable, "-m", "pip", "install", *missing])
+        print(f"Successfully installed {', '.join(missing)}")
+    except subprocess.CalledProcessError as e:
+        print(f"Error installing {', '.join(missing)}: {e}")
+        sys.exit(1)
 
 if __name__ == "__main__":
     install_packages()
@@ -0,0 +1,289 @@
+"""
+Runs the fetch -> DC -> features -> HMM workflow over a universe of symbols.
+
+Each stage declares the artifacts it reads and writes. Symbols are fanned out
+across worker processes, and a stage is skipped when the fingerprint of its
+code, parameters and input files matches the one recorded by its last
+successful run. The code fingerprint covers the stage function and the
+modules it declares in `code`, so editing e.g. dc_indicators.py recomputes
+what depends on it. Fetch always runs; when the data it fetched is
+unchanged, nothing downstream is redone.
+
+Prices come from Alpha Vantage (or seeded dummy data without an API key)
+unless --prices-csv names a file pattern such as "{symbol}_last_year.csv",
+in which case every symbol is read from its CSV and a missing file fails
+that symbol's fetch.
+
+    python pipeline.py ^NSEI AAPL GOOGL --threshold 0.01 --workers 4
+    python pipeline.py AAPL GOOGL --prices-csv "{symbol}_last_year.csv"
+"""
+import os
+import sys
+import json
+import time
+import zlib
+import hashlib
+import inspect
+import argparse
+import importlib.util
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+DEFAULT_ROOT = "data/pipeline"
+DEFAULT_PARAMS = {
+    "threshold": 0.01,
+    "window": 60,
+    "n_components": 2,
+    "min_events": 20,
+    "prices_csv": None,
+    "hmm_features": ["dc_return", "overshoot", "time_adjusted_return"],
+}
+FINGERPRINT_FILE = ".fingerprints.json"
+
+
+class Stage:
+    """
+    A step run once per symbol, reading `inputs` and writing `outputs` (artifact
+    names). `code` lists the modules the step delegates to; their sources are
+    part of its fingerprint.
+    """
+
+    def __init__(self, name, func, inputs=(), outputs=(), params=(), code=(), always_run=False):
+        self.name = name
+        self.func = func
+        self.inputs = tuple(inputs)
+        self.outputs = tuple(outputs)
+        self.params = tuple(params)
+        self.code = tuple(code)
+        self.always_run = always_run
+
+
+def _write_parquet(df, path):
+    tmp_path = f"{path}.tmp"
+    df.to_parquet(tmp_path)
+    os.replace(tmp_path, path)
+
+
+def fetch_stage(symbol, inputs, outputs, params):
+    from fetch_and_save_data import fetch_prices
+
+    if params["prices_csv"]:
+        path = params["prices_csv"].format(symbol=symbol)
+        prices = pd.read_csv(path, index_col=0, parse_dates=True)[["Close"]]
+    else:
+        prices = fetch_prices(symbol, dummy_seed=zlib.crc32(symbol.encode()))
+    _write_parquet(prices, outputs["prices"])
+
+
+def dc_stage(symbol, inputs, outputs, params):
+    from directional_change import detect_directional_changes
+    from dc_indicators import dc_event_table
+
+    close = pd.read_parquet(inputs["prices"])["Close"]
+    events = detect_directional_changes(close, params["threshold"])
+    _write_parquet(dc_event_table(close, events), outputs["events"])
+
+
+def features_stage(symbol, inputs, outputs, params):
+    from dc_indicators import dc_indicators
+
+    table = pd.read_parquet(inputs["events"])
+    features = dc_indicators(table, params["threshold"], params["window"])
+    _write_parquet(features[table["complete"].to_numpy(dtype=bool)], outputs["features"])
+
+
+def hmm_stage(symbol, inputs, outputs, params):
+    from hmm_model import train_and_evaluate_hmm
+    from regime_filter import OnlineRegimeFilter
+
+    features = pd.read_parquet(inputs["features"])[params["hmm_features"]]
+    if len(features) < params["min_events"]:
+        raise ValueError(f"only {len(features)} complete DC events; need at least {params['min_events']}")
+    model, log_likelihood = train_and_evaluate_hmm(features.to_numpy(), n_components=params["n_components"])
+    if model is None:
+        raise RuntimeError(f"HMM training failed on {len(features)} events")
+    probabilities = OnlineRegimeFilter(model).update_many(features.to_numpy())
+    regimes = pd.DataFrame(probabilities, index=features.index,
+                           columns=[f"p{k}" for k in range(params["n_components"])])
+    regimes.insert(0, "state", model.predict(features.to_numpy()))
+    regimes.attrs["log_likelihood"] = float(log_likelihood)
+    _write_parquet(regimes, outputs["regimes"])
+
+
+STAGES = [
+    Stage("fetch", fetch_stage, outputs=["prices"], params=["prices_csv"],
+          code=["fetch_and_save_data"], always_run=True),
+    Stage("dc", dc_stage, inputs=["prices"], outputs=["events"], params=["threshold"],
+          code=["directional_change", "dc_indicators"]),
+    Stage("features", features_stage, inputs=["events"], outputs=["features"], params=["threshold", "window"],
+          code=["dc_indicators"]),
+    Stage("hmm", hmm_stage, inputs=["features"], outputs=["regimes"], params=["n_components", "hmm_features", "min_events"],
+          code=["hmm_model", "regime_filter"]),
+]
+
+
+def order_stages(stages):
+    """Orders stages so every input is produced before it is read; raises ValueError otherwise."""
+    producers = {}
+    for stage in stages:
+        for artifact in stage.outputs:
+            if artifact in producers:
+                raise ValueError(f"artifact {artifact!r} is produced by both {producers[artifact]} and {stage.name}")
+            producers[artifact] = stage.name
+    ordered, done, remaining = [], set(), list(stages)
+    while remaining:
+        ready = [s for s in remaining if all(producers.get(a) in done for a in s.inputs)]
+        if not ready:
+            missing = {a for s in remaining for a in s.inputs if a not in producers}
+            reason = f"no stage produces {sorted(missing)}" if missing else "stages form a cycle"
+            raise ValueError(f"cannot order stages: {reason}")
+        for stage in ready:
+            ordered.append(stage)
+            done.add(stage.name)
+            remaining.remove(stage)
+    return ordered
+
+
+def _file_digest(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def fingerprint(stage, input_paths, params):
+    """Hash of the stage's code, the parameters it declares and the contents of its inputs."""
+    digest = hashlib.sha256(stage.name.encode())
+    digest.update(inspect.getsource(stage.func).encode())
+    for module in stage.code:
+        spec = importlib.util.find_spec(module)
+        if spec is None or not spec.origin:
+            raise ValueError(f"stage {stage.name} depends on unknown module {module!r}")
+        digest.update(_file_digest(spec.origin).encode())
+    digest.update(json.dumps({k: params[k] for k in stage.params}, sort_keys=True, default=str).encode())
+    for artifact in stage.inputs:
+        digest.update(_file_digest(input_paths[artifact]).encode())
+    return digest.hexdigest()
+
+
+def artifact_path(root, symbol, artifact):
+    return os.path.join(root, symbol.replace(os.sep, "_"), f"{artifact}.parquet")
+
+
+def run_symbol(symbol, stages, root, params, force=False):
+    """Runs `stages` in order for one symbol; returns one timing record per stage."""
+    directory = os.path.dirname(artifact_path(root, symbol, "x"))
+    os.makedirs(directory, exist_ok=True)
+    manifest_path = os.path.join(directory, FINGERPRINT_FILE)
+    try:
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        manifest = {}
+
+    records = []
+    failed = False
+    for stage in stages:
+        record = {"symbol": symbol, "stage": stage.name}
+        records.append(record)
+        if failed:
+            record.update(status="blocked", seconds=0.0)
+            continue
+        start = time.perf_counter()
+        inputs = {a: artifact_path(root, symbol, a) for a in stage.inputs}
+        outputs = {a: artifact_path(root, symbol, a) for a in stage.outputs}
+        try:
+            key = fingerprint(stage, inputs, params)
+            up_to_date = (manifest.get(stage.name) == key
+                          and all(os.path.exists(p) for p in outputs.values()))
+            if up_to_date and not (force or stage.always_run):
+                record["status"] = "skipped"
+            else:
+                stage.func(symbol, inputs, outputs, params)
+                manifest[stage.name] = key
+                record["status"] = "ran"
+        except Exception as e:
+            failed = True
+            manifest.pop(stage.name, None)
+            record.update(status="failed", error=f"{type(e).__name__}: {e}",
+                          traceback=traceback.format_exc())
+        record["seconds"] = round(time.perf_counter() - start, 6)
+
+    tmp_path = f"{manifest_path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, manifest_path)
+    return records
+
+
+def run_pipeline(symbols, root=DEFAULT_ROOT, params=None, workers=None, force=False, stages=STAGES):
+    """Runs the pipeline for every symbol across `workers` processes; returns all timing records."""
+    params = {**DEFAULT_PARAMS, **(params or {})}
+    stages = order_stages(stages)
+    if workers == 1:
+        results = [run_symbol(symbol, stages, root, params, force) for symbol in symbols]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(run_symbol, symbol, stages, root, params, force) for symbol in symbols]
+            results = [future.result() for future in futures]
+    return [record for records in results for record in records]
+
+
+def timing_report(records):
+    """Per-stage table of how many symbols ran, were skipped or failed, and how long they took."""
+    stages = {}
+    for record in records:
+        stats = stages.setdefault(record["stage"], {"ran": 0, "skipped": 0, "failed": 0, "blocked": 0,
+                                                    "total_s": 0.0, "max_s": 0.0})
+        stats[record["status"]] += 1
+        stats["total_s"] += record["seconds"]
+        stats["max_s"] = max(stats["max_s"], record["seconds"])
+    lines = [f"{'stage':<10} {'ran':>5} {'skipped':>8} {'failed':>7} {'blocked':>8} {'total_s':>9} {'max_s':>8}"]
+    for name, s in stages.items():
+        lines.append(f"{name:<10} {s['ran']:>5} {s['skipped']:>8} {s['failed']:>7} {s['blocked']:>8} "
+                     f"{s['total_s']:>9.3f} {s['max_s']:>8.3f}")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the DC + HMM pipeline over many symbols")
+    parser.add_argument("symbols", nargs="*", help="Symbols to process")
+    parser.add_argument("--symbols-file", help="File with one symbol per line")
+    parser.add_argument("--root", default=DEFAULT_ROOT, help="Where per-symbol artifacts are kept")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_PARAMS["threshold"], help="DC threshold")
+    parser.add_argument("--window", type=int, default=DEFAULT_PARAMS["window"], help="Event frequency window in bars")
+    parser.add_argument("--n-components", type=int, default=DEFAULT_PARAMS["n_components"], help="HMM states")
+    parser.add_argument("--prices-csv", metavar="PATTERN",
+                        help='Read prices from CSV files instead of fetching, e.g. "{symbol}_last_year.csv"')
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--force", action="store_true", help="Rerun every stage even if its inputs are unchanged")
+    parser.add_argument("--report", help="Write the per-stage timing records to this JSON file")
+    args = parser.parse_args()
+
+    symbols = list(args.symbols)
+    if args.symbols_file:
+        with open(args.symbols_file) as f:
+            symbols += [line.strip() for line in f if line.strip()]
+    if not symbols:
+        parser.error("no symbols given")
+
+    params = {"threshold": args.threshold, "window": args.window, "n_components": args.n_components,
+              "prices_csv": os.path.abspath(args.prices_csv) if args.prices_csv else None}
+    start = time.perf_counter()
+    records = run_pipeline(symbols, args.root, params, args.workers, args.force)
+    print(timing_report(records))
+    print(f"{len(symbols)} symbols in {time.perf_counter() - start:.2f}s")
+    for record in records:
+        if record["status"] == "failed":
+            print(f"{record['symbol']} {record['stage']}: {record['error']}", file=sys.stderr)
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(records, f, indent=2)
+    sys.exit(1 if any(r["status"] == "failed" for r in records) else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+import numpy as np
+from scipy import linalg
+
+# Jitter added to a covariance whose Cholesky fails. GaussianHMM scores with
+# hmmlearn.stats' default rather than model.min_covar (which only floors the
+# covariances during fitting), so the same value keeps the two in agreement.
+FALLBACK_MIN_COVAR = 1e-7
+
+
+def _logsumexp(a, axis=None):
+    peak = np.max(a, axis=axis, keepdims=True)
+    peak = np.where(np.isfinite(peak), peak, 0.0)
+    with np.errstate(divide="ignore"):
+        total = np.log(np.sum(np.exp(a - peak), axis=axis, keepdims=True)) + peak
+    return np.squeeze(total, axis=axis) if axis is not None else total.item()
+
+
+class OnlineRegimeFilter:
+    """
+    Incremental forward filter for a fitted hmmlearn GaussianHMM.
+
+    Keeps the normalized forward vector log P(state_t | x_1..x_t) and updates
+    it in O(K^2 + K*D^2) per observation, so labelling the regime of each new
+    bar or DC event does not rerun Viterbi over the whole history.
+
+    Usage:
+        regime = OnlineRegimeFilter(best_model)
+        for x in new_observations:
+            probabilities = regime.update(x)
+    """
+
+    def __init__(self, model):
+        self.n_components = model.n_components
+        # Forbidden transitions become -inf, which the log-space updates handle.
+        with np.errstate(divide="ignore"):
+            self.log_startprob = np.log(model.startprob_)
+            self.log_transmat = np.log(model.transmat_)
+        self.means = np.asarray(model.means_, dtype=float)
+        # covars_ is (K, D, D) whatever the model's covariance_type.
+        covars = np.asarray(model.covars_, dtype=float)
+        n_features = self.means.shape[1]
+        cholesky = np.empty_like(covars)
+        for k, covar in enumerate(covars):
+            try:
+                cholesky[k] = linalg.cholesky(covar, lower=True)
+            except linalg.LinAlgError:
+                # Same fallback as hmmlearn for near-singular covariances.
+                cholesky[k] = linalg.cholesky(covar + FALLBACK_MIN_COVAR * np.eye(n_features), lower=True)
+        self._inv_cholesky = np.linalg.inv(cholesky)
+        log_det = 2 * np.log(np.diagonal(cholesky, axis1=1, axis2=2)).sum(axis=1)
+        self._log_norm = -0.5 * (n_features * np.log(2 * np.pi) + log_det)
+        self.reset()
+
+    def reset(self):
+        self.log_alpha = None
+        self.log_likelihood = 0.0
+        self.n_observations = 0
+
+    def _log_emission(self, x):
+        z = np.einsum("kij,kj->ki", self._inv_cholesky, x - self.means)
+        return self._log_norm - 0.5 * np.einsum("ki,ki->k", z, z)
+
+    def update(self, x):
+        """Folds in one observation (a scalar or a length-D vector) and returns the filtered probabilities."""
+        log_b = self._log_emission(np.atleast_1d(np.asarray(x, dtype=float)))
+        if self.log_alpha is None:
+            log_alpha = self.log_startprob + log_b
+        else:
+            log_alpha = _logsumexp(self.log_alpha[:, None] + self.log_transmat, axis=0) + log_b
+        log_evidence = _logsumexp(log_alpha)
+        self.log_alpha = log_alpha - log_evidence
+        self.log_likelihood += log_evidence
+        self.n_observations += 1
+        return self.probabilities
+
+    def update_many(self, observations):
+        """Filters each row of `observations` in turn; returns an (n, K) array of filtered probabilities."""
+        observations = np.asarray(observations, dtype=float)
+        if observations.ndim == 1:
+            observations = observations.reshape(-1, 1)
+        return np.array([self.update(x) for x in observations]).reshape(-1, self.n_components)
+
+    @property
+    def probabilities(self):
+        if self.log_alpha is None:
+            return np.exp(self.log_startprob)
+        return np.exp(self.log_alpha)
+
+    @property
+    def state(self):
+        """Most probable current regime."""
+        return int(np.argmax(self.probabilities))
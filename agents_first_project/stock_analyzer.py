@@ -1,8 +1,6 @@
 
 import requests
 import pandas as pd
-import matplotlib.pyplot as plt
-import mplfinance as mpf
 import datetime
 import time # Import the time module
 import os
@@ -47,6 +45,8 @@ def save_data_to_csv(df, symbol):
 def plot_ohlc(df, symbol):
     print(f"Plotting OHLC for {symbol}...")
     fig_name = f"{symbol}_ohlc.png"
+    import mplfinance as mpf
+
     mpf.plot(df, type="candle", style="yahoo", title=f"{symbol} OHLC Last Year",
              ylabel="Price", savefig=fig_name)
     print(f"OHLC plot for {symbol} saved to {fig_name}")
@@ -0,0 +1,37 @@
+import numpy as np
+import pandas as pd
+from directional_change import detect_directional_changes
+from dc_indicators import dc_event_table, dc_indicators, feature_matrix
+
+rng = np.random.default_rng(1)
+prices = pd.Series(100 * np.exp(np.cumsum(rng.normal(0, 0.01, 500))),
+                   index=pd.date_range("2024-01-01", periods=500, freq="D"))
+threshold = 0.02
+events = detect_directional_changes(prices, threshold)
+table = dc_event_table(prices, events)
+
+# Reference: walk the bars between confirmations with a plain loop.
+values = prices.to_numpy()
+confirmations = list(np.flatnonzero(events.to_numpy()))
+starts = [0] + confirmations
+for k, dc in enumerate(confirmations):
+    up = events.iloc[dc] == 1
+    segment = values[starts[k]:dc]
+    extreme = starts[k] + (segment.argmin() if up else segment.argmax())
+    tail = values[dc:confirmations[k + 1]] if k + 1 < len(confirmations) else values[dc:]
+    os_end = dc + (tail.argmax() if up else tail.argmin())
+    row = table.iloc[k]
+    assert (row["extreme_idx"], row["dc_idx"], row["os_end_idx"]) == (extreme, dc, os_end), (k, row)
+
+features = dc_indicators(table, threshold, window=30)
+assert (features["overshoot"] >= 0).all()
+assert (features["tmv"].iloc[:-1] >= 1).all()
+assert (np.sign(features["dc_return"]) == table["direction"]).all()
+assert features["frequency"].iloc[-1] == ((table["dc_idx"] > table["dc_idx"].iloc[-1] - 30)).sum()
+print(len(table), "events")
+print(features.head())
+
+matrix = feature_matrix({"A": prices, "B": prices * 2}, threshold, window=30, columns=["tmv", "overshoot"])
+assert list(matrix.columns) == ["tmv", "overshoot"]
+assert len(matrix) == 2 * (len(table) - 1)
+print(matrix.loc["B"].head(3))
@@ -0,0 +1,65 @@
+import os
+import tempfile
+from pipeline import run_pipeline, timing_report, order_stages, Stage, STAGES
+
+os.environ.pop("ALPHAVANTAGE_API_KEY", None)
+root = tempfile.mkdtemp()
+symbols = ["SYM1", "SYM2"]
+params = {"threshold": 0.003}
+
+first = run_pipeline(symbols, root, params, workers=2)
+print(timing_report(first))
+assert all(r["status"] == "ran" for r in first), first
+
+# Fetch reruns but produces the same data, so nothing downstream is redone.
+second = run_pipeline(symbols, root, params, workers=2)
+print(timing_report(second))
+assert {r["stage"] for r in second if r["status"] == "ran"} == {"fetch"}, second
+
+# A parameter only the HMM stage declares reruns just that stage.
+third = run_pipeline(symbols, root, params={**params, "n_components": 3}, workers=1)
+print(timing_report(third))
+assert {r["stage"] for r in third if r["status"] == "ran"} == {"fetch", "hmm"}, third
+
+# A failing stage blocks the ones after it for that symbol only.
+fourth = run_pipeline(symbols, root, params={**params, "min_events": 10 ** 6}, workers=1)
+assert [r["status"] for r in fourth if r["stage"] == "hmm"] == ["failed", "failed"], fourth
+
+try:
+    order_stages([Stage("a", None, inputs=["missing"])])
+except ValueError as e:
+    print(e)
+else:
+    raise AssertionError("expected a ValueError")
+assert [s.name for s in order_stages(list(reversed(STAGES)))] == ["fetch", "dc", "features", "hmm"]
+
+# Editing a module a stage declares in `code` invalidates that stage.
+import sys
+import json
+
+
+def copy_stage(symbol, inputs, outputs, params):
+    import scale_helper
+    with open(outputs["copy"], "w") as f:
+        json.dump(scale_helper.FACTOR, f)
+
+
+helpers = tempfile.mkdtemp()
+sys.path.insert(0, helpers)
+with open(os.path.join(helpers, "scale_helper.py"), "w") as f:
+    f.write("FACTOR = 1\n")
+stages = [Stage("copy", copy_stage, outputs=["copy"], code=["scale_helper"])]
+statuses = [run_pipeline(["SYM1"], root, workers=1, stages=stages)[0]["status"]]
+statuses.append(run_pipeline(["SYM1"], root, workers=1, stages=stages)[0]["status"])
+with open(os.path.join(helpers, "scale_helper.py"), "w") as f:
+    f.write("FACTOR = 2\n")
+statuses.append(run_pipeline(["SYM1"], root, workers=1, stages=stages)[0]["status"])
+assert statuses == ["ran", "skipped", "ran"], statuses
+
+# Prices are read from CSV files only when asked to.
+csv_records = run_pipeline(["AAPL"], tempfile.mkdtemp(), {"prices_csv": os.path.abspath("{symbol}_last_year.csv")},
+                           workers=1, stages=STAGES[:1])
+assert csv_records[0]["status"] == "ran", csv_records
+missing = run_pipeline(["NOPE"], tempfile.mkdtemp(), {"prices_csv": "{symbol}_last_year.csv"},
+                       workers=1, stages=STAGES[:1])
+assert missing[0]["status"] == "failed" and "FileNotFoundError" in missing[0]["error"], missing
@@ -0,0 +1,37 @@
+import warnings
+import numpy as np
+from hmmlearn import hmm
+from regime_filter import OnlineRegimeFilter
+
+warnings.filterwarnings("ignore")
+
+rng = np.random.default_rng(0)
+returns = np.concatenate([rng.normal(0.001, 0.005, 150), rng.normal(-0.002, 0.02, 100), rng.normal(0.001, 0.005, 50)])
+
+for covariance_type, data in (("full", returns.reshape(-1, 1)),
+                              ("diag", np.column_stack([returns, np.abs(returns)]))):
+    model = hmm.GaussianHMM(n_components=2, covariance_type=covariance_type, n_iter=50, random_state=42)
+    model.fit(data)
+
+    regime = OnlineRegimeFilter(model)
+    filtered = regime.update_many(data)
+
+    # The filtered distribution at t is the smoothed posterior of the last row of x_1..x_t.
+    for t in (0, 10, 149, 200, len(data) - 1):
+        expected = model.predict_proba(data[:t + 1])[-1]
+        assert np.allclose(filtered[t], expected, atol=1e-8), (covariance_type, t, filtered[t], expected)
+    assert np.isclose(regime.log_likelihood, model.score(data)), (regime.log_likelihood, model.score(data))
+    assert np.allclose(filtered.sum(axis=1), 1)
+    print(covariance_type, "current state:", regime.state, "probabilities:", np.round(regime.probabilities, 4))
+
+# A constant feature on a short sequence leaves near-singular covariances;
+# the filter must fall back like hmmlearn does instead of raising.
+rng = np.random.default_rng(0)
+degenerate = np.column_stack([rng.normal(0, 0.03, 8), np.zeros(8), rng.normal(0.01, 0.005, 8)])
+model = hmm.GaussianHMM(n_components=2, covariance_type="full", n_iter=100, random_state=42)
+model.fit(degenerate)
+regime = OnlineRegimeFilter(model)
+filtered = regime.update_many(degenerate)
+assert np.allclose(filtered[-1], model.predict_proba(degenerate)[-1], atol=1e-6), (filtered[-1], model.predict_proba(degenerate)[-1])
+assert np.isclose(regime.log_likelihood, model.score(degenerate)), (regime.log_likelihood, model.score(degenerate))
+print("degenerate current state:", regime.state, "probabilities:", np.round(regime.probabilities, 4))
@@ -0,0 +1,140 @@
+"""
+Runs many agent tasks concurrently from a JSONL file.
+
+Each line is a JSON object with a "prompt" (or "title"/"body") and an
+optional "id" (or "request_id"). Every task works on its own snapshot of the
+workspace (see workspace.py) and shares one API client; one result line per task is written to
+the output JSONL in the order tasks finish.
+
+    uv run batch.py tasks.jsonl --output results.jsonl --concurrency 4
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import threading
+import traceback
+from argparse import Namespace
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dotenv import load_dotenv
+from call_functions import WORKING_DIRECTORY, ToolResultCache
+from main import call_agent
+from tracing import Tracer
+from workspace import Snapshot
+
+
+class _ThreadStdout:
+    """Routes print() from each task thread to that task's log file."""
+
+    def __init__(self, default):
+        self.default = default
+        self.local = threading.local()
+
+    def _target(self):
+        return getattr(self.local, "stream", None) or self.default
+
+    def write(self, data):
+        return self._target().write(data)
+
+    def flush(self):
+        self._target().flush()
+
+
+def load_tasks(path):
+    """Reads tasks from JSONL; repeated ids get a "-2", "-3"... suffix so every task has its own workspace and log."""
+    tasks = []
+    seen = set()
+    with open(path) as f:
+        for n, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            task = json.loads(line)
+            prompt = task.get("prompt") or "\n\n".join(
+                part for part in (task.get("title"), task.get("body")) if part
+            )
+            task_id = base_id = str(task.get("id") or task.get("request_id") or n).replace(os.sep, "_")
+            suffix = 2
+            while task_id in seen:
+                task_id = f"{base_id}-{suffix}"
+                suffix += 1
+            seen.add(task_id)
+            tasks.append({"id": task_id, "prompt": prompt})
+    return tasks
+
+
+def run_task(client, task, workspace, root, stdout, trace):
+    start = time.perf_counter()
+    record = {"id": task["id"], "workspace": None}
+    log_path = os.path.join(root, f"{task['id']}.log")
+    with open(log_path, "w") as log:
+        stdout.local.stream = log
+        tracer = Tracer(os.path.join(root, f"{task['id']}.trace.jsonl")) if trace else None
+        try:
+            snapshot = Snapshot.create(workspace, os.path.join(root, task["id"]))
+            record["workspace"] = snapshot.path
+            stats = {}
+            args = Namespace(user_prompt=task["prompt"], verbose=False)
+            record["status"] = call_agent(client, args, tracer, working_directory=snapshot.path,
+                                          cache=ToolResultCache(), stats=stats)
+            record.update(stats)
+            record["changes"] = snapshot.changes()
+        except Exception as e:
+            traceback.print_exc(file=log)
+            record["status"] = "error"
+            record["error"] = f"{type(e).__name__}: {e}"
+        finally:
+            stdout.local.stream = None
+            if tracer is not None:
+                tracer.close()
+    record["latency_s"] = round(time.perf_counter() - start, 3)
+    record["log"] = log_path
+    return record
+
+
+def run_batch(client, tasks, output, workspace=WORKING_DIRECTORY, concurrency=4, root=None, trace=False):
+    """Runs `tasks` and appends one result per task to `output`; returns the number that failed."""
+    root = root or tempfile.mkdtemp(prefix="finagent-batch-")
+    os.makedirs(root, exist_ok=True)
+    stdout = _ThreadStdout(sys.stdout)
+    sys.stdout = stdout
+    failures = 0
+    try:
+        with open(output, "w") as out, ThreadPoolExecutor(max_workers=concurrency) as pool:
+            futures = [pool.submit(run_task, client, task, workspace, root, stdout, trace) for task in tasks]
+            for future in as_completed(futures):
+                record = future.result()
+                failures += record["status"] != 0
+                out.write(json.dumps(record) + "\n")
+                out.flush()
+                print(f"[{record['id']}] status={record['status']} latency={record['latency_s']}s", file=stdout.default)
+    finally:
+        sys.stdout = stdout.default
+    return failures
+
+
+def main():
+    load_dotenv()
+    parser = argparse.ArgumentParser(description="Run agent tasks from a JSONL file concurrently")
+    parser.add_argument("tasks", help="JSONL file with one task per line")
+    parser.add_argument("--output", default="results.jsonl", help="Where to write one result per task")
+    parser.add_argument("--concurrency", type=int, default=4, help="Maximum number of tasks run at once")
+    parser.add_argument("--workspace", default=WORKING_DIRECTORY, help="Directory each task gets a private copy of")
+    parser.add_argument("--workspaces-dir", help="Where task copies, logs and traces are kept (default: a temp dir)")
+    parser.add_argument("--trace", action="store_true", help="Write a JSONL trace per task next to its log")
+    args = parser.parse_args()
+
+    api_key = os.environ.get("GEMINI_API_KEY")
+    if api_key is None:
+        raise RuntimeError("No Key found")
+    from google import genai
+
+    client = genai.Client(api_key=api_key)
+    failures = run_batch(client, load_tasks(args.tasks), args.output, args.workspace,
+                         args.concurrency, args.workspaces_dir, args.trace)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,54 @@
 # calculator/main.py
 
 import sys
+import time
 from pkg.calculator import Calculator
-from pkg.render import format_json_output
+from pkg.render import format_json_output, format_ndjson_line
+
+# Output lines collected before each write to stdout.
+BATCH_LINES = 1024
+
+
+def stream(calculator, lines, out):
+    """
+    Evaluates one expression per input line and writes one NDJSON result per
+    non-blank line. A bad expression produces an error record for that line
+    and evaluation carries on. Returns the number of errors.
+    """
+    buffer = []
+    errors = 0
+    for n, line in enumerate(lines, start=1):
+        expression = line.strip()
+        if not expression:
+            continue
+        try:
+            buffer.append(format_ndjson_line(expression, calculator.evaluate(expression)))
+        except Exception as e:
+            errors += 1
+            buffer.append(format_ndjson_line(expression, error=str(e), line=n))
+        if len(buffer) >= BATCH_LINES:
+            out.write("\n".join(buffer) + "\n")
+            buffer.clear()
+    if buffer:
+        out.write("\n".join(buffer) + "\n")
+    out.flush()
+    return errors
+
+
+def bench(count):
+    import io
+    import random
+
+    rng = random.Random(0)
+    ops = "+-*/"
+    lines = [
+        f"({rng.randint(1, 99)} {rng.choice(ops)} {rng.randint(1, 99)}) * {rng.randint(1, 99)} - {rng.randint(1, 99)}"
+        for _ in range(count)
+    ]
+    start = time.perf_counter()
+    stream(Calculator(), lines, io.StringIO())
+    elapsed = time.perf_counter() - start
+    print(f"{count} expressions in {elapsed:.3f}s ({count / elapsed:,.0f} lines/s)")
 
 
 def main():
@@ -10,9 +56,18 @@ def main():
     if len(sys.argv) <= 1:
         print("Calculator App")
         print('Usage: python main.py "<expression>"')
+        print("       python main.py --stream < expressions.txt > results.ndjson")
+        print("       python main.py --bench [count]")
         print('Example: python main.py "3 + 5"')
         return
 
+    if sys.argv[1] == "--stream":
+        errors = stream(calculator, sys.stdin, sys.stdout)
+        sys.exit(1 if errors else 0)
+    if sys.argv[1] == "--bench":
+        bench(int(sys.argv[2]) if len(sys.argv) > 2 else 100_000)
+        return
+
     expression = " ".join(sys.argv[1:])
     try:
         result = calculator.evaluate(expression)
@@ -26,4 +81,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
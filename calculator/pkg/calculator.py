@@ -1,61 +1,241 @@
 # calculator/pkg/calculator.py
 
-class Calculator:
-    def __init__(self):
-        self.operators = {
-            "+": lambda a, b: a + b,
-            "-": lambda a, b: a - b,
-            "*": lambda a, b: a * b,
-            "/": lambda a, b: a / b,
-        }
-        self.precedence = {
-            "+": 1,
-            "-": 1,
-            "*": 2,
-            "/": 2,
-        }
-
-    def evaluate(self, expression):
-        if not expression or expression.isspace():
-            return None
-        tokens = expression.strip().split()
-        return self._evaluate_infix(tokens)
-
-    def _evaluate_infix(self, tokens):
-        values = []
-        operators = []
-
-        for token in tokens:
-            if token in self.operators:
-                while (
-                    operators
-                    and operators[-1] in self.operators
-                    and self.precedence[operators[-1]] >= self.precedence[token]
-                ):
-                    self._apply_operator(operators, values)
-                operators.append(token)
-            else:
+import math
+import operator
+import re
+from functools import lru_cache, reduce
+
+OPERATORS = {
+    "+": operator.add,
+    "-": operator.sub,
+    "*": operator.mul,
+    "/": operator.truediv,
+}
+PRECEDENCE = {
+    "+": 1,
+    "-": 1,
+    "*": 2,
+    "/": 2,
+}
+# Unary minus binds tighter than any binary operator: "-a * b" is "(-a) * b".
+NEG_PRECEDENCE = 3
+
+# name -> (min_args, max_args); None means any number of arguments.
+FUNCTIONS = {
+    "log": (1, 1),
+    "abs": (1, 1),
+    "min": (2, None),
+    "max": (2, None),
+}
+SCALAR_FUNCTIONS = {"log": math.log, "abs": abs, "min": min, "max": max}
+# NumPy ufunc used for each function when any argument is an array or NumPy scalar.
+ARRAY_FUNCTIONS = {"log": "log", "abs": "absolute", "min": "minimum", "max": "maximum"}
+# Names usable without a binding, in any letter case. They are looked up only
+# when the caller does not bind the name, so {"inf": 3} still means 3.
+CONSTANTS = {"inf": math.inf, "nan": math.nan}
+
+TOKEN = re.compile(r"""
+    \s*(?:
+        (?P<num>(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)
+      | (?P<name>[A-Za-z_]\w*)
+      | (?P<sym>[-+*/(),])
+      | (?P<bad>\S)
+    )""", re.VERBOSE)
+
+
+def tokenize(expression):
+    """Splits `expression` into (kind, value) tokens in a single left-to-right scan."""
+    tokens = []
+    # Every non-space character starts a match, so finditer leaves no gaps.
+    for match in TOKEN.finditer(expression):
+        kind = match.lastgroup
+        value = match.group(kind)
+        if kind == "num":
+            tokens.append(("num", float(value)))
+        elif kind == "sym":
+            tokens.append(("sym", value))
+        elif kind == "name":
+            tokens.append(("name", value))
+        else:
+            raise ValueError(f"invalid token: {value}")
+    return tokens
+
+
+def _apply_function(name, args):
+    # Arrays and NumPy scalars both carry a dtype; either selects the ufunc.
+    if any(hasattr(a, "dtype") for a in args):
+        import numpy as np
+
+        ufunc = getattr(np, ARRAY_FUNCTIONS[name])
+        return ufunc(args[0]) if len(args) == 1 else reduce(ufunc, args)
+    return SCALAR_FUNCTIONS[name](*args)
+
+
+class Program:
+    """
+    A compiled expression: a postfix sequence of instructions.
+
+    Each instruction is ("num", value), ("var", name), ("op", symbol),
+    ("neg", None) or ("call", (function, argc)). Operators and functions work
+    on scalars and NumPy arrays alike, so running a program over arrays
+    evaluates every row in one pass per instruction.
+    """
+
+    def __init__(self, expression, instructions):
+        self.expression = expression
+        self.instructions = instructions
+
+    @property
+    def variables(self):
+        return {arg for kind, arg in self.instructions if kind == "var" and arg.lower() not in CONSTANTS}
+
+    def run(self, variables=None, number=float):
+        """
+        Runs the program with `variables` bound and returns the result.
+
+        `number` converts numeric literals and constants before use; pass
+        numpy.float64 so they follow NumPy semantics alongside array operands.
+        """
+        stack = []
+        for kind, arg in self.instructions:
+            if kind == "num":
+                stack.append(number(arg))
+            elif kind == "var":
                 try:
-                    values.append(float(token))
-                except ValueError:
-                    raise ValueError(f"invalid token: {token}")
+                    stack.append(variables[arg])
+                except (KeyError, TypeError):
+                    constant = CONSTANTS.get(arg.lower())
+                    if constant is None:
+                        raise ValueError(f"unknown variable: {arg}")
+                    stack.append(number(constant))
+            elif kind == "op":
+                b = stack.pop()
+                a = stack.pop()
+                stack.append(OPERATORS[arg](a, b))
+            elif kind == "neg":
+                stack.append(-stack.pop())
+            else:
+                name, argc = arg
+                args = stack[-argc:]
+                del stack[-argc:]
+                stack.append(_apply_function(name, args))
+        return stack[0]
+
+
+@lru_cache(maxsize=1024)
+def compile_expression(expression):
+    """Parses `expression` once into a Program; repeated calls hit the LRU cache."""
+    tokens = tokenize(expression)
+    if not tokens:
+        raise ValueError("invalid expression")
+    output = []
+    # Pending operators: ("op", symbol), ("neg", None) or ("(", function or None).
+    pending = []
+    arg_counts = []
+    expect_operand = True
+    i = 0
+    while i < len(tokens):
+        kind, value = tokens[i]
+        i += 1
+        if kind in ("num", "name"):
+            if not expect_operand:
+                raise ValueError("invalid expression")
+            if kind == "name" and i < len(tokens) and tokens[i] == ("sym", "("):
+                if value not in FUNCTIONS:
+                    raise ValueError(f"unknown function: {value}")
+                pending.append(("(", value))
+                arg_counts.append(1)
+                i += 1
+                continue
+            output.append(("num", value) if kind == "num" else ("var", value))
+            expect_operand = False
+        elif value in OPERATORS:
+            if expect_operand:
+                if value != "-":
+                    raise ValueError(f"not enough operands for operator {value}")
+                pending.append(("neg", None))
+                continue
+            while pending and pending[-1][0] != "(" and _precedence(pending[-1]) >= PRECEDENCE[value]:
+                output.append(pending.pop())
+            pending.append(("op", value))
+            expect_operand = True
+        elif value == "(":
+            if not expect_operand:
+                raise ValueError("invalid expression")
+            pending.append(("(", None))
+        elif value == ")":
+            if expect_operand:
+                raise ValueError("invalid expression")
+            while pending and pending[-1][0] != "(":
+                output.append(pending.pop())
+            if not pending:
+                raise ValueError("unbalanced parentheses")
+            _, function = pending.pop()
+            if function is not None:
+                output.append(("call", (function, _check_arity(function, arg_counts.pop()))))
+        else:  # ","
+            if expect_operand:
+                raise ValueError("invalid expression")
+            while pending and pending[-1][0] != "(":
+                output.append(pending.pop())
+            if not pending or pending[-1][1] is None:
+                raise ValueError("unexpected ','")
+            arg_counts[-1] += 1
+            expect_operand = True
+    if expect_operand:
+        last = tokens[-1][1]
+        raise ValueError(f"not enough operands for operator {last}" if last in OPERATORS else "invalid expression")
+    while pending:
+        if pending[-1][0] == "(":
+            raise ValueError("unbalanced parentheses")
+        output.append(pending.pop())
+    return Program(expression, tuple(output))
+
 
-        while operators:
-            self._apply_operator(operators, values)
+def _precedence(entry):
+    kind, value = entry
+    return NEG_PRECEDENCE if kind == "neg" else PRECEDENCE[value]
 
-        if len(values) != 1:
-            raise ValueError("invalid expression")
 
-        return values[0]
+def _check_arity(function, argc):
+    low, high = FUNCTIONS[function]
+    if argc < low or (high is not None and argc > high):
+        expected = str(low) if low == high else f"at least {low}"
+        raise ValueError(f"{function}() takes {expected} argument(s), got {argc}")
+    return argc
+
+
+class Calculator:
+    def __init__(self):
+        self.operators = OPERATORS
+        self.precedence = PRECEDENCE
+        self.functions = FUNCTIONS
+
+    def compile(self, expression):
+        return compile_expression(expression.strip())
+
+    def evaluate(self, expression, variables=None):
+        if not expression or expression.isspace():
+            return None
+        return self.compile(expression).run(variables)
 
-    def _apply_operator(self, operators, values):
-        if not operators:
-            return
+    def evaluate_many(self, expression, variables):
+        """
+        Evaluates `expression` over arrays of operand values in one vectorized pass.
 
-        operator = operators.pop()
-        if len(values) < 2:
-            raise ValueError(f"not enough operands for operator {operator}")
+        `variables` maps each variable name in the expression to a scalar,
+        sequence or array; all of them must broadcast together. Returns a
+        NumPy array.
+        """
+        import numpy as np
 
-        b = values.pop()
-        a = values.pop()
-        values.append(self.operators[operator](a, b))
\ No newline at end of file
+        program = self.compile(expression)
+        arrays = {name: np.asarray(values, dtype=float) for name, values in variables.items()}
+        # Rows that divide by zero or take log(0) become inf/nan instead of failing
+        # the batch; literals run as float64 so constant subexpressions do too.
+        with np.errstate(divide="ignore", invalid="ignore"):
+            result = np.asarray(program.run(arrays, number=np.float64), dtype=float)
+        if arrays:
+            shape = np.broadcast_shapes(*(a.shape for a in arrays.values()))
+            result = np.broadcast_to(result, shape)
+        return result
@@ -1,16 +1,30 @@
 # calculator/pkg/render.py
 
 import json
+import math
 
 
-def format_json_output(expression: str, result: float, indent: int = 2) -> str:
+def _result_fields(result):
+    # inf and nan have no JSON literal: emit null and name the value instead.
+    if isinstance(result, float) and not math.isfinite(result):
+        return {"result": None, "non_finite": str(result)}
     if isinstance(result, float) and result.is_integer():
-        result_to_dump = int(result)
-    else:
-        result_to_dump = result
+        return {"result": int(result)}
+    return {"result": result}
 
+
+def format_json_output(expression: str, result: float, indent: int = 2) -> str:
     output_data = {
         "expression": expression,
-        "result": result_to_dump,
+        **_result_fields(result),
     }
-    return json.dumps(output_data, indent=indent)
\ No newline at end of file
+    return json.dumps(output_data, indent=indent, allow_nan=False)
+
+
+def format_ndjson_line(expression: str, result: float = None, error: str = None, line: int = None) -> str:
+    """One compact JSON object per line; errors carry the input line number instead of a result."""
+    if error is None:
+        output_data = {"expression": expression, **_result_fields(result)}
+    else:
+        output_data = {"line": line, "expression": expression, "error": error}
+    return json.dumps(output_data, separators=(",", ":"), allow_nan=False)
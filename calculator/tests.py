@@ -1,7 +1,10 @@
 # calculator/tests.py
 
 import unittest
+import io
+import json
 from pkg.calculator import Calculator
+from main import stream
 
 
 class TestCalculator(unittest.TestCase):
@@ -44,6 +47,112 @@ class TestCalculator(unittest.TestCase):
         with self.assertRaises(ValueError):
             self.calculator.evaluate("+ 3")
 
+    def test_no_whitespace_needed(self):
+        self.assertEqual(self.calculator.evaluate("3*4+5"), 17)
+        self.assertEqual(self.calculator.evaluate("1.5e1/3"), 5)
+
+    def test_parentheses(self):
+        self.assertEqual(self.calculator.evaluate("(3 + 5) * 2"), 16)
+        self.assertEqual(self.calculator.evaluate("2 * (3 - (4 - 1))"), 0)
+
+    def test_unbalanced_parentheses(self):
+        with self.assertRaises(ValueError):
+            self.calculator.evaluate("(3 + 5")
+        with self.assertRaises(ValueError):
+            self.calculator.evaluate("3 + 5)")
+
+    def test_unary_minus(self):
+        self.assertEqual(self.calculator.evaluate("-3 + 5"), 2)
+        self.assertEqual(self.calculator.evaluate("2 * -3"), -6)
+        self.assertEqual(self.calculator.evaluate("-(2 + 3) * 2"), -10)
+
+    def test_functions(self):
+        self.assertAlmostEqual(self.calculator.evaluate("log(x)", {"x": 10}), 2.302585092994046)
+        self.assertEqual(self.calculator.evaluate("abs(2 - 7)"), 5)
+        self.assertEqual(self.calculator.evaluate("min(4, 2, 3) + max(1, a)", {"a": 6}), 8)
+
+    def test_function_errors(self):
+        with self.assertRaises(ValueError):
+            self.calculator.evaluate("sqrt(4)")
+        with self.assertRaises(ValueError):
+            self.calculator.evaluate("log(1, 2)")
+        with self.assertRaises(ValueError):
+            self.calculator.evaluate("max(1)")
+        with self.assertRaises(ValueError):
+            self.calculator.evaluate("1, 2")
+
+    def test_variables(self):
+        result = self.calculator.evaluate("a * 2 + b", {"a": 3, "b": 1})
+        self.assertEqual(result, 7)
+
+    def test_constants_yield_to_bindings(self):
+        self.assertEqual(self.calculator.evaluate("INF"), float("inf"))
+        self.assertEqual(self.calculator.evaluate("inf + 1", {"inf": 3}), 4)
+        self.assertEqual(self.calculator.compile("x * inf").variables, {"x"})
+
+    def test_unknown_variable(self):
+        with self.assertRaises(ValueError):
+            self.calculator.evaluate("a + 1")
+
+    def test_compile_is_cached(self):
+        program = self.calculator.compile("3 * x + 5")
+        self.assertIs(program, self.calculator.compile("3 * x + 5"))
+        self.assertEqual(program.variables, {"x"})
+
+    def test_evaluate_many(self):
+        import numpy as np
+
+        result = self.calculator.evaluate_many("a - b / 2", {"a": [1, 2, 3], "b": [2, 4, 6]})
+        np.testing.assert_allclose(result, [0, 0, 0])
+
+    def test_evaluate_many_constant(self):
+        import numpy as np
+
+        result = self.calculator.evaluate_many("2 * 3", {"a": np.zeros(4)})
+        np.testing.assert_allclose(result, [6, 6, 6, 6])
+
+    def test_array_variables(self):
+        import numpy as np
+
+        close = np.array([11.0, 9.0, 10.0])
+        open_ = np.array([10.0, 10.0, 10.0])
+        result = self.calculator.evaluate("(close - open) / open", {"close": close, "open": open_})
+        np.testing.assert_allclose(result, [0.1, -0.1, 0.0])
+
+    def test_evaluate_many_functions(self):
+        import numpy as np
+
+        result = self.calculator.evaluate_many("max(abs(a), 2) + log(b)", {"a": [-3, 1], "b": [1, 0]})
+        np.testing.assert_allclose(result, [3, -np.inf])
+
+    def test_evaluate_many_constant_domain_error(self):
+        import numpy as np
+
+        result = self.calculator.evaluate_many("log(0) + x", {"x": [1, 2]})
+        np.testing.assert_allclose(result, [-np.inf, -np.inf])
+        with self.assertRaises(ValueError):
+            self.calculator.evaluate("log(0)")
+
+
+class TestStream(unittest.TestCase):
+    def test_stream_reports_errors_per_line(self):
+        out = io.StringIO()
+        errors = stream(Calculator(), ["3 + 5\n", "\n", "(2 * 3\n", "10 / 4\n"], out)
+        records = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual(errors, 1)
+        self.assertEqual(records[0], {"expression": "3 + 5", "result": 8})
+        self.assertEqual(records[1]["line"], 3)
+        self.assertIn("error", records[1])
+        self.assertEqual(records[2]["result"], 2.5)
+        self.assertNotIn(" ", out.getvalue().splitlines()[0].replace("3 + 5", ""))
+
+    def test_stream_non_finite_results_are_valid_json(self):
+        out = io.StringIO()
+        stream(Calculator(), ["1e400\n", "-inf - 1\n", "nan\n"], out)
+        records = [json.loads(line, parse_constant=self.fail) for line in out.getvalue().splitlines()]
+        self.assertEqual([r["result"] for r in records], [None, None, None])
+        self.assertEqual([r["non_finite"] for r in records], ["inf", "-inf", "nan"])
+
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
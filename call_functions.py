@@ -1,50 +1,172 @@
-from google.genai import types
-from functions.get_files_info import get_files_info, schema_get_files_info
-from functions.get_file_content import get_file_content, schema_get_file_content
-from functions.run_python_file import schema_run_python_file, run_python_file
-from functions.write_file import schema_write_file, write_file
-from functions.install_packages import schema_install_packages, install_packages
-
-available_functions = types.Tool(
-    function_declarations=[schema_get_files_info,
-                           schema_write_file,
-                           schema_run_python_file,
-                           schema_get_file_content,
-                           schema_install_packages
-                           ]
-)
-def call_function(function_call, verbose=False):
-    if verbose:
-        print(f"Calling function: {function_call.name}({function_call.args})")
-    else:
-        print(f" - Calling function: {function_call.name}")
-    function_map = {
-        "get_files_info": get_files_info,
-        "get_file_content": get_file_content,
-        "write_file": write_file,
-        "run_python_file": run_python_file
-    }
+import os
+import importlib
+from tracing import payload_size
+
+WORKING_DIRECTORY = "./agents_first_project"
+
+# Tool name -> module defining it and its schema_<name> declaration. Modules
+# are imported on first use so that importing this module (and main.py)
+# does not pay for google.genai.
+TOOL_MODULES = {
+    "get_files_info": "functions.get_files_info",
+    "write_file": "functions.write_file",
+    "edit_file": "functions.edit_file",
+    "run_python_file": "functions.run_python_file",
+    "get_file_content": "functions.get_file_content",
+    "install_packages": "functions.install_packages",
+    "search_files": "functions.search_files",
+}
+
+
+def _tool(name, prefix=""):
+    return getattr(importlib.import_module(TOOL_MODULES[name]), prefix + name)
+
+
+def __getattr__(name):
+    if name == "available_functions":
+        from google.genai import types
+
+        tool = types.Tool(function_declarations=[_tool(n, "schema_") for n in TOOL_MODULES])
+        globals()[name] = tool
+        return tool
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+# Read-only tools whose results can be served from the cache, mapped to the
+# argument holding the path they read and its default value.
+READ_ONLY_TOOLS = {
+    "get_files_info": ("directory", "."),
+    "get_file_content": ("file_path", "."),
+}
+# Tools that act on the environment rather than the working directory.
+NO_WORKING_DIRECTORY = {"install_packages"}
+# Tools that modify the file named by their "file_path" argument.
+WRITE_TOOLS = {"write_file", "edit_file"}
+
+
+class ToolResultCache:
+    """
+    Session-scoped memo of read-only tool calls.
+
+    Entries are keyed by the tool name and its arguments and remember the
+    (mtime, size) of the path that was read. A repeated call on an unchanged
+    path is answered with a short marker instead of the full payload.
+    """
+
+    def __init__(self):
+        self._entries = {}
+
+    @staticmethod
+    def _fingerprint(path):
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    @staticmethod
+    def _key(function_name, args):
+        return (function_name, tuple(sorted((k, repr(v)) for k, v in args.items())))
+
+    def lookup(self, function_name, args, path):
+        entry = self._entries.get(self._key(function_name, args))
+        if entry is None:
+            return False
+        fingerprint = self._fingerprint(path)
+        return fingerprint is not None and entry[1] == fingerprint
+
+    def store(self, function_name, args, path):
+        fingerprint = self._fingerprint(path)
+        if fingerprint is not None:
+            self._entries[self._key(function_name, args)] = (path, fingerprint)
+
+    def invalidate(self, path):
+        """Drops entries for `path` and for any directory listing containing it."""
+        for key, (cached_path, _) in list(self._entries.items()):
+            if cached_path == path or os.path.commonpath([cached_path, path]) == cached_path:
+                del self._entries[key]
+
+    def invalidate_listings(self):
+        """Drops all directory listings, e.g. after running arbitrary code."""
+        for key in list(self._entries):
+            if key[0] == "get_files_info":
+                del self._entries[key]
+
+    def clear(self):
+        self._entries.clear()
+
+
+session_cache = ToolResultCache()
+
+
+def _resolve(working_directory, path):
+    return os.path.normpath(os.path.join(os.path.abspath(working_directory), path))
+
+
+def _function_response(function_name, response):
+    from google.genai import types
 
-    function_name = function_call.name or ""
-    if function_map.get(function_name) is None:
-        return types.Content(
-            role="tool",
-            parts=[
-                types.Part.from_function_response(
-                    name=function_name,
-                    response={"error": f"Unknown function: {function_name}"},
-                )
-            ],
-        )
-    args = dict(function_call.args) if function_call.args else {}
-    args['working_directory'] = "./agents_first_project"
-    function_result = function_map[function_name](**args)
     return types.Content(
         role="tool",
         parts=[
             types.Part.from_function_response(
                 name=function_name,
-                response={"result": function_result},
+                response=response,
             )
         ],
-    )
\ No newline at end of file
+    )
+
+
+def call_function(function_call, verbose=False, cache=session_cache, tracer=None,
+                  working_directory=WORKING_DIRECTORY):
+    if verbose:
+        print(f"Calling function: {function_call.name}({function_call.args})")
+    else:
+        print(f" - Calling function: {function_call.name}")
+    if tracer is None:
+        return _call_function(function_call, verbose, cache, working_directory)[0]
+
+    with tracer.span("tool_call", name=function_call.name, args=dict(function_call.args or {})) as span:
+        content, cache_hit = _call_function(function_call, verbose, cache, working_directory)
+        response = content.parts[0].function_response.response
+        span["cache_hit"] = cache_hit
+        span["result_bytes"] = payload_size(response)
+        span["result"] = response
+    return content
+
+
+def _call_function(function_call, verbose, cache, working_directory):
+    """Dispatches the call; returns the tool Content and whether it was a cache hit."""
+    function_name = function_call.name or ""
+    if function_name not in TOOL_MODULES:
+        return _function_response(function_name, {"error": f"Unknown function: {function_name}"}), False
+    args = dict(function_call.args) if function_call.args else {}
+    if function_name not in NO_WORKING_DIRECTORY:
+        args['working_directory'] = working_directory
+    if function_name == "run_python_file":
+        args['echo'] = verbose
+
+    target = None
+    if cache is not None and function_name in READ_ONLY_TOOLS:
+        arg_name, default = READ_ONLY_TOOLS[function_name]
+        target = _resolve(args['working_directory'], args.get(arg_name, default))
+        if cache.lookup(function_name, args, target):
+            marker = f'[unchanged since last read: {function_name} "{args.get(arg_name, default)}" returned the same result earlier in this session]'
+            return _function_response(function_name, {"result": marker}), True
+
+    function_result = _tool(function_name)(**args)
+
+    if function_name in WRITE_TOOLS and "file_path" in args:
+        from functions.search_files import notify_file_changed
+
+        notify_file_changed(args['working_directory'], args["file_path"])
+        if cache is not None:
+            cache.invalidate(_resolve(args['working_directory'], args["file_path"]))
+    elif function_name == "run_python_file":
+        from functions.search_files import mark_dirty
+
+        mark_dirty(args['working_directory'])
+        if cache is not None:
+            cache.invalidate_listings()
+    elif cache is not None and target is not None and not str(function_result).startswith("Error:"):
+        cache.store(function_name, args, target)
+    return _function_response(function_name, {"result": function_result}), False
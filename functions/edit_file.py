@@ -0,0 +1,195 @@
+import os
+import re
+import difflib
+from google.genai import types
+from functions.write_file import atomic_write
+
+HUNK_HEADER = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
+
+
+def _apply_replacements(text, edits):
+    for n, edit in enumerate(edits, start=1):
+        old = edit.get("old_string", "")
+        new = edit.get("new_string", "")
+        if not old:
+            raise ValueError(f"edit {n}: old_string must not be empty")
+        count = text.count(old)
+        if count == 0:
+            raise ValueError(f"edit {n}: old_string not found")
+        if count > 1 and not edit.get("replace_all"):
+            raise ValueError(f"edit {n}: old_string matches {count} times; add context or set replace_all")
+        text = text.replace(old, new)
+    return text
+
+
+# A line is everything up to and including "\n". Unlike str.splitlines(), this
+# leaves form feeds, \x1c-\x1e, \x85 and \u2028 inside the line they belong to.
+LINE = re.compile(r"[^\n]*\n|[^\n]+")
+
+
+def _split_lines(text):
+    return LINE.findall(text)
+
+
+def _body(line):
+    """A line without its ending ("\n" or "\r\n")."""
+    line = line[:-1] if line.endswith("\n") else line
+    return line[:-1] if line.endswith("\r") else line
+
+
+def _parse_hunks(diff):
+    hunks = []
+
+    def close_hunk():
+        # Models often end a diff with a blank line; it is not context.
+        body = hunks[-1][2]
+        while body and body[-1] == "":
+            body.pop()
+        body[:] = [" " if line == "" else line for line in body]
+
+    for line in map(_body, _split_lines(diff)):
+        match = HUNK_HEADER.match(line)
+        if match:
+            if hunks:
+                close_hunk()
+            old_count = int(match.group(2)) if match.group(2) is not None else 1
+            hunks.append((int(match.group(1)), old_count, []))
+        elif hunks and line[:1] in (" ", "-", "+"):
+            hunks[-1][2].append(line)
+        elif hunks and line == "":
+            # Some generators drop the leading space on blank context lines.
+            hunks[-1][2].append("")
+    if not hunks:
+        raise ValueError("diff contains no hunks")
+    close_hunk()
+    return hunks
+
+
+def _find_block(lines, block, expected):
+    """Index where `block` occurs in `lines`, preferring the one nearest `expected`."""
+    n = len(block)
+    if lines[expected:expected + n] == block:
+        return expected
+    for distance in range(1, len(lines) + 1):
+        for start in (expected - distance, expected + distance):
+            if 0 <= start <= len(lines) - n and lines[start:start + n] == block:
+                return start
+        if expected - distance < 0 and expected + distance > len(lines) - n:
+            break
+    return -1
+
+
+def _apply_diff(text, diff):
+    newline = "\r\n" if "\r\n" in text else "\n"
+    lines = _split_lines(text)
+    delta = 0
+    for n, (old_start, old_count, body) in enumerate(_parse_hunks(diff), start=1):
+        old_block = [line[1:] for line in body if line[0] in (" ", "-")]
+        # A hunk with no old lines inserts after line old_start, not at it.
+        expected = max(0, (old_start if old_count == 0 else old_start - 1) + delta)
+        start = _find_block([_body(line) for line in lines], old_block, expected)
+        if start < 0:
+            raise ValueError(f"hunk {n} (line {old_start}) does not match the file")
+        # Context lines keep their original text and ending; added lines use
+        # the file's newline style.
+        new_lines = []
+        i = start
+        for line in body:
+            if line[0] == " ":
+                new_lines.append(lines[i])
+                i += 1
+            elif line[0] == "-":
+                i += 1
+            else:
+                new_lines.append(line[1:] + newline)
+        at_end = start + len(old_block) == len(lines)
+        if at_end and lines and not lines[-1].endswith("\n") and new_lines:
+            new_lines[-1] = _body(new_lines[-1])
+        lines[start:start + len(old_block)] = new_lines
+        delta += len(new_lines) - len(old_block)
+    return "".join(lines)
+
+
+def _changed_ranges(old_text, new_text):
+    old_lines = [_body(line) for line in _split_lines(old_text)]
+    new_lines = [_body(line) for line in _split_lines(new_text)]
+    matcher = difflib.SequenceMatcher(None, old_lines, new_lines, autojunk=False)
+    ranges = []
+    for tag, _, _, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            continue
+        if j2 > j1:
+            ranges.append(f"{j1 + 1}-{j2}" if j2 - j1 > 1 else f"{j1 + 1}")
+        else:
+            ranges.append(f"deleted before line {j1 + 1}")
+    return ranges
+
+
+def edit_file(working_directory, file_path, edits=None, diff=None):
+    abs_working_dir = os.path.abspath(working_directory)
+    target_file = os.path.normpath(os.path.join(abs_working_dir, file_path))
+
+    if os.path.commonpath([target_file, abs_working_dir]) != abs_working_dir:
+        return f'Error: Cannot edit "{file_path}" as it is outside the permitted working directory'
+    if not os.path.isfile(target_file):
+        return f'Error: "{file_path}" is not a file'
+    if bool(edits) == bool(diff):
+        return 'Error: Provide exactly one of "edits" or "diff"'
+
+    try:
+        with open(target_file, "r", newline="") as f:
+            original = f.read()
+    except (UnicodeDecodeError, OSError) as e:
+        return f'Error: Cannot read "{file_path}": {e}'
+    try:
+        if edits:
+            updated = _apply_replacements(original, [dict(edit) for edit in edits])
+        else:
+            updated = _apply_diff(original, diff)
+    except ValueError as e:
+        return f'Error: Cannot edit "{file_path}": {e}'
+
+    if updated == original:
+        return f'No changes made to "{file_path}"'
+    try:
+        atomic_write(target_file, updated)
+    except OSError as e:
+        return f'Error: Cannot write "{file_path}": {e}'
+    ranges = _changed_ranges(original, updated)
+    return f'Successfully edited "{file_path}"; changed lines: {", ".join(ranges)}'
+
+schema_edit_file = types.FunctionDeclaration(
+    name="edit_file",
+    description=(
+        "Edits part of an existing file without resending the whole content, either through "
+        "exact-match replacements or a unified diff. The change is applied atomically and the "
+        "changed line ranges are reported"
+    ),
+    parameters=types.Schema(
+        type=types.Type.OBJECT,
+        properties={
+            "file_path": types.Schema(
+                type=types.Type.STRING,
+                description="Path of the file to edit, relative to the working directory"
+            ),
+            "edits": types.Schema(
+                type=types.Type.ARRAY,
+                description="Replacements applied in order. Each old_string must match the file exactly and, unless replace_all is set, only once",
+                items=types.Schema(
+                    type=types.Type.OBJECT,
+                    properties={
+                        "old_string": types.Schema(type=types.Type.STRING, description="Exact text to replace"),
+                        "new_string": types.Schema(type=types.Type.STRING, description="Replacement text"),
+                        "replace_all": types.Schema(type=types.Type.BOOLEAN, description="Replace every occurrence (default false)"),
+                    },
+                    required=["old_string", "new_string"],
+                ),
+            ),
+            "diff": types.Schema(
+                type=types.Type.STRING,
+                description="Unified diff (with @@ hunk headers) to apply to the file, as an alternative to edits"
+            ),
+        },
+        required=["file_path"],
+    ),
+)
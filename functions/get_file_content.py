@@ -1,26 +1,111 @@
 import os
+import mmap
 from google.genai import types
 
-def get_file_content(working_directory, file_path="."):
+MAX_CHARS = 10000
+
+
+def _read_lines(mm, file_path, offset, limit):
+    # Skip to the start of line `offset` (1-based) without decoding the head.
+    pos = 0
+    size = len(mm)
+    for _ in range(offset - 1):
+        pos = mm.find(b"\n", pos) + 1
+        if pos == 0:
+            return f'Error: "{file_path}" has fewer than {offset} lines'
+    if offset > 1 and pos >= size:
+        # The file ends with the newline that closed the last line.
+        return f'Error: "{file_path}" has fewer than {offset} lines'
+
+    lines = []
+    used = 0
+    line_no = offset
+    marker = None
+    while pos < size:
+        if limit is not None and line_no >= offset + limit:
+            marker = f'[...more lines follow in "{file_path}"; continue with offset={line_no}]'
+            break
+        end = mm.find(b"\n", pos)
+        end = size if end == -1 else end + 1
+        prefix = f"{line_no:>6}\t"
+        if not lines and len(prefix) + (end - pos) > MAX_CHARS:
+            # A single line longer than the cap (minified JSON, binaries...):
+            # return its head and continue by byte offset.
+            cut = pos + MAX_CHARS - len(prefix)
+            while cut > pos and mm[cut] & 0xC0 == 0x80:
+                cut -= 1  # don't split a UTF-8 sequence
+            lines.append(prefix + mm[pos:cut].decode("utf-8", errors="replace"))
+            marker = (f'[...line {line_no} of "{file_path}" is longer than {MAX_CHARS} characters and was cut; '
+                      f'continue with unit="bytes", offset={cut}]')
+            break
+        # Characters never outnumber bytes, so only decode lines that may fit.
+        if end - pos > 4 * MAX_CHARS:
+            line = None
+        else:
+            line = prefix + mm[pos:end].decode("utf-8", errors="replace")
+        if line is None or used + len(line) > MAX_CHARS:
+            marker = f'[...File "{file_path}" truncated at {MAX_CHARS} characters; continue with offset={line_no}]'
+            break
+        lines.append(line)
+        used += len(line)
+        pos = end
+        line_no += 1
+
+    ans = "".join(lines)
+    if marker:
+        if ans and not ans.endswith("\n"):
+            ans += "\n"
+        ans += marker
+    return ans
+
+
+def _read_bytes(mm, file_path, offset, limit):
+    size = len(mm)
+    if offset >= size:
+        return f'Error: offset {offset} is past the end of "{file_path}" ({size} bytes)'
+    end = min(size, offset + (MAX_CHARS if limit is None else min(limit, MAX_CHARS)))
+    ans = mm[offset:end].decode("utf-8", errors="replace")
+    if end < size:
+        if not ans.endswith("\n"):
+            ans += "\n"
+        ans += f'[...File "{file_path}" has {size} bytes; continue with offset={end}]'
+    return ans
+
+
+def get_file_content(working_directory, file_path=".", offset=None, limit=None, unit="lines"):
     abs_working_dir = os.path.abspath(working_directory)
     target_file = os.path.normpath(os.path.join(abs_working_dir, file_path))
 
     if os.path.commonpath([target_file, abs_working_dir]) != abs_working_dir:
         return f'Error: Cannot read "{file_path}" as it is outside the permitted working directory'
-        
+
     if not os.path.isfile(target_file):
         print(target_file)
         return f'Error: "{file_path}" is not a file'
-    MAX_CHARS = 10000
-    with open(target_file, 'r') as f:
-        ans = f.read(MAX_CHARS)
-        if(f.read(1)):
-            ans += f'[...File "{file_path}" truncated at {MAX_CHARS} characters]'
-    return ans
+    if unit not in ("lines", "bytes"):
+        return f'Error: unit must be "lines" or "bytes", got "{unit}"'
+
+    offset = int(offset) if offset is not None else (1 if unit == "lines" else 0)
+    limit = int(limit) if limit is not None else None
+    if offset < (1 if unit == "lines" else 0) or (limit is not None and limit <= 0):
+        return f'Error: invalid offset/limit ({offset}, {limit})'
+
+    with open(target_file, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return ""
+        # mmap lets us seek to a region of a large file without reading the head.
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if unit == "bytes":
+                return _read_bytes(mm, file_path, offset, limit)
+            return _read_lines(mm, file_path, offset, limit)
 
 schema_get_file_content = types.FunctionDeclaration(
     name='get_file_content',
-    description='Retrieves the content of a specified file relative to the working directory',
+    description=(
+        'Retrieves the content of a specified file relative to the working directory. '
+        'Lines are prefixed with their line numbers; output is capped at 10000 characters, '
+        'use offset/limit to page through large files'
+    ),
     parameters=types.Schema(
         type=types.Type.OBJECT,
         properties={
@@ -28,6 +113,19 @@ schema_get_file_content = types.FunctionDeclaration(
                 type=types.Type.STRING,
                 description="Path to the file relative to the current working directory"
             ),
+            "offset": types.Schema(
+                type=types.Type.INTEGER,
+                description="Where to start reading: 1-based line number (default 1), or byte offset when unit is 'bytes' (default 0)"
+            ),
+            "limit": types.Schema(
+                type=types.Type.INTEGER,
+                description="Maximum number of lines (or bytes when unit is 'bytes') to return"
+            ),
+            "unit": types.Schema(
+                type=types.Type.STRING,
+                description="Unit for offset and limit: 'lines' (default) or 'bytes'",
+                enum=["lines", "bytes"],
+            ),
         },
     ),
-)
\ No newline at end of file
+)
@@ -1,27 +1,82 @@
 import os
+from fnmatch import fnmatch
 from google.genai import types
 
-def get_files_info(working_directory, directory="."):
+MAX_ENTRIES = 200
+# Skipped in recursive listings unless the caller passes its own ignore list.
+# A trailing "/" restricts a pattern to directories.
+DEFAULT_IGNORE = [".git/", ".venv/", "venv/", "__pycache__/", ".pytest_cache/", "data/", "*.pyc"]
+
+
+def matches_any(patterns, name, rel_path, is_dir):
+    for pattern in patterns:
+        if pattern.endswith("/"):
+            if not is_dir:
+                continue
+            pattern = pattern[:-1]
+        if fnmatch(name, pattern) or fnmatch(rel_path, pattern):
+            return True
+    return False
+
+
+def _walk(target_dir, rel_dir, depth, max_depth, include, ignore, max_entries, lines):
+    """Appends entry lines for `target_dir`; returns False once `max_entries` is hit."""
+    try:
+        with os.scandir(target_dir) as it:
+            entries = sorted(it, key=lambda e: e.name)
+    except OSError as e:
+        lines.append(f' - {rel_dir or "."}/: skipped, cannot be read ({e.strerror})')
+        return True
+    for entry in entries:
+        rel_path = os.path.join(rel_dir, entry.name) if rel_dir else entry.name
+        # DirEntry caches the d_type and stat results, so no extra syscalls per check.
+        is_dir = entry.is_dir()
+        if ignore and matches_any(ignore, entry.name, rel_path, is_dir):
+            continue
+        if not is_dir and include and not matches_any(include, entry.name, rel_path, False):
+            continue
+        if len(lines) >= max_entries:
+            return False
+        try:
+            size = entry.stat().st_size
+        except OSError:
+            size = 0
+        lines.append(f' - {rel_path}: filesize={size}, is_dir={is_dir}')
+        # Never descend through a symlink: it can point outside the working directory.
+        if is_dir and depth < max_depth and not entry.is_symlink():
+            if not _walk(entry.path, rel_path, depth + 1, max_depth, include, ignore, max_entries, lines):
+                return False
+    return True
+
+
+def get_files_info(working_directory, directory=".", recursive=False, max_depth=None,
+                   include=None, ignore=None, max_entries=MAX_ENTRIES):
     abs_working_dir = os.path.abspath(working_directory)
     target_dir = os.path.normpath(os.path.join(abs_working_dir, directory))
 
     if os.path.commonpath([target_dir, abs_working_dir]) != abs_working_dir:
         return f'Error: Cannot list "{directory}" as it is outside the permitted working directory'
-        return
     if not os.path.isdir(target_dir):
         return f'Error: "{directory}" is not a directory'
-        
+
+    if recursive:
+        max_depth = int(max_depth) if max_depth is not None else 5
+        if ignore is None:
+            ignore = DEFAULT_IGNORE
+    else:
+        max_depth = 0
+    max_entries = int(max_entries)
+
     current = "current" if directory == "." else directory
-    ans = ""
-    ans+= f"Result for {current} directory:"
-    for f in os.listdir(target_dir):
-        filename = os.path.join(target_dir,f)
-        ans+= f' - {f}: filesize={os.path.getsize(filename)}, is_dir={os.path.isdir(filename)}\n'
-    return ans
+    lines = [f"Result for {current} directory:"]
+    complete = _walk(target_dir, "", 0, max_depth, include or [], ignore or [], max_entries + 1, lines)
+    if not complete:
+        lines.append(f"[...listing truncated at {max_entries} entries; narrow it with directory, include or max_depth]")
+    return "\n".join(lines) + "\n"
 
 schema_get_files_info = types.FunctionDeclaration(
     name="get_files_info",
-    description="Lists files in a specified directory relative to the working directory, providing file size and directory status",
+    description="Lists files in a specified directory relative to the working directory, providing file size and directory status. Can walk the whole tree in one call with recursive=true",
     parameters=types.Schema(
         type=types.Type.OBJECT,
         properties={
@@ -29,6 +84,28 @@ schema_get_files_info = types.FunctionDeclaration(
                 type=types.Type.STRING,
                 description="Directory path to list files from, relative to the working directory (default is the working directory itself)",
             ),
+            "recursive": types.Schema(
+                type=types.Type.BOOLEAN,
+                description="List subdirectories recursively (default false)",
+            ),
+            "max_depth": types.Schema(
+                type=types.Type.INTEGER,
+                description="Maximum depth to descend when recursive (default 5)",
+            ),
+            "include": types.Schema(
+                type=types.Type.ARRAY,
+                description="Glob patterns files must match to be listed, e.g. ['*.py']",
+                items=types.Schema(type=types.Type.STRING),
+            ),
+            "ignore": types.Schema(
+                type=types.Type.ARRAY,
+                description="Glob patterns of entries to skip; a trailing '/' matches directories only. Recursive listings skip .venv/, __pycache__/, data/ etc. by default",
+                items=types.Schema(type=types.Type.STRING),
+            ),
+            "max_entries": types.Schema(
+                type=types.Type.INTEGER,
+                description=f"Maximum number of entries to return (default {MAX_ENTRIES})",
+            ),
         },
     ),
-)
\ No newline at end of file
+)
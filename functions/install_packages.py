@@ -1,47 +1,114 @@
 import os
-from google.genai import types
+import sys
+import shutil
+import importlib
 import subprocess
+from importlib import metadata
+from google.genai import types
+
+try:
+    from packaging.requirements import InvalidRequirement, Requirement
+except ImportError:  # packaging normally comes in with matplotlib
+    Requirement = None
+
+# Local directory of wheels used when installing offline; fill it with
+# `pip download -d <dir> <packages>` (or `pip wheel`) while online.
+WHEEL_CACHE = os.environ.get("FINAGENT_WHEEL_CACHE", os.path.expanduser("~/.cache/finagent/wheels"))
+
+def _is_satisfied(package):
+    """True if an installed distribution already satisfies the requirement string."""
+    if Requirement is None:
+        name, _, pinned = package.partition("==")
+        try:
+            installed = metadata.version(name.strip())
+        except metadata.PackageNotFoundError:
+            return False
+        return not pinned or installed == pinned.strip()
+    try:
+        requirement = Requirement(package)
+    except InvalidRequirement:
+        return False  # let the installer report it
+    if requirement.marker is not None and not requirement.marker.evaluate():
+        return True  # not needed on this platform
+    if requirement.url:
+        return False
+    try:
+        installed = metadata.version(requirement.name)
+    except metadata.PackageNotFoundError:
+        return False
+    return requirement.specifier.contains(installed, prereleases=True)
+
+
+def _install_command(packages, offline):
+    if shutil.which("uv"):
+        command = ["uv", "pip", "install"]
+        if offline:
+            command += ["--offline", "--no-index", "--find-links", WHEEL_CACHE]
+    else:
+        command = [sys.executable, "-m", "pip", "install"]
+        if offline:
+            command += ["--no-index", "--find-links", WHEEL_CACHE]
+    return command + packages
 
-def install_packages(packages):
+
+def install_packages(packages, offline=False):
     """
     Installs Python packages into the current environment using uv.
 
+    Requirements already satisfied by an installed distribution are skipped,
+    and the rest are resolved together in a single installer call. A
+    successful install makes later requests for the same packages free;
+    a failed one (e.g. a network error) is retried on the next call.
+
     Args:
         packages: A list of package names, e.g. ["numpy", "pandas==2.1.0"]
+        offline: Install only from the local wheel cache (FINAGENT_WHEEL_CACHE),
+            without network access. Also enabled by FINAGENT_OFFLINE=1.
 
     Returns:
-        Combined stdout and stderr from the installation command.
+        A summary of skipped packages plus the installer's stdout and stderr.
     """
     if not packages:
         return "No packages specified."
+    offline = offline or os.environ.get("FINAGENT_OFFLINE") == "1"
+
+    requested = list(dict.fromkeys(p.strip() for p in packages if p.strip()))
+    satisfied = [p for p in requested if _is_satisfied(p)]
+    missing = [p for p in requested if p not in satisfied]
 
-    command = ["uv", "pip", "install"] + packages
+    output = []
+    if satisfied:
+        output.append(f"Already installed: {', '.join(satisfied)}")
+    if not missing:
+        return "\n".join(output)
 
     try:
         result = subprocess.run(
-            command,
+            _install_command(missing, offline),
             capture_output=True,
             text=True,
             check=False
         )
-
-        output = []
-        if result.stdout:
-            output.append("STDOUT:\n" + result.stdout)
-        if result.stderr:
-            output.append("STDERR:\n" + result.stderr)
-
-        return "\n".join(output) if output else "Installation completed with no output."
-
     except FileNotFoundError:
-        return "Error: uv is not installed or not available in PATH."
+        return "Error: neither uv nor pip is available to install packages."
     except Exception as e:
         return f"Unexpected error during installation: {e}"
-    
+
+    installed = []
+    if result.returncode == 0:
+        importlib.invalidate_caches()
+        installed.append(f"Installed: {', '.join(missing)}")
+    if result.stdout:
+        installed.append("STDOUT:\n" + result.stdout)
+    if result.stderr:
+        installed.append("STDERR:\n" + result.stderr)
+    output.append("\n".join(installed) if installed else "Installation completed with no output.")
+    return "\n".join(output)
+
 
 schema_install_packages = types.FunctionDeclaration(
     name='install_packages',
-    description='Installs specified python packages in current environment using uv',
+    description='Installs specified python packages in current environment using uv, skipping any that are already installed',
     parameters=types.Schema(
         type=types.Type.OBJECT,
         properties={
@@ -52,6 +119,10 @@ schema_install_packages = types.FunctionDeclaration(
                     type=types.Type.STRING
                 )
             ),
+            "offline": types.Schema(
+                type=types.Type.BOOLEAN,
+                description="Install only from the local wheel cache, without network access (default false)"
+            ),
         },
     ),
-)
\ No newline at end of file
+)
@@ -0,0 +1,95 @@
+"""
+Bounded, streaming capture of a child process's stdout and stderr.
+
+Output is read from pipes as it is produced. Only the first HEAD_BYTES and
+the last TAIL_BYTES of each stream are kept, so a chatty or runaway script
+cannot exhaust memory or the model's prompt, and whatever was captured is
+still available if the run is killed on timeout.
+"""
+import os
+import time
+import selectors
+
+HEAD_BYTES = 4096
+TAIL_BYTES = 8192
+
+
+class BoundedOutput:
+    """Keeps the head and a ring-buffered tail of a byte stream."""
+
+    def __init__(self, head_bytes=HEAD_BYTES, tail_bytes=TAIL_BYTES, echo=None):
+        self.head_bytes = head_bytes
+        self.tail_bytes = tail_bytes
+        self.echo = echo
+        self.head = bytearray()
+        self.tail = bytearray()
+        self.total = 0
+
+    def feed(self, data):
+        self.total += len(data)
+        if self.echo is not None:
+            self.echo.write(data)
+            self.echo.flush()
+        room = self.head_bytes - len(self.head)
+        if room > 0:
+            self.head += data[:room]
+            data = data[room:]
+        if data:
+            self.tail += data
+            # Trim lazily so the ring costs amortized O(1) per byte.
+            if len(self.tail) > 2 * self.tail_bytes:
+                del self.tail[:-self.tail_bytes]
+
+    @property
+    def omitted(self):
+        return self.total - len(self.head) - min(len(self.tail), self.tail_bytes)
+
+    def text(self):
+        tail = bytes(self.tail[-self.tail_bytes:]) if self.tail else b""
+        if self.omitted > 0:
+            marker = f"\n[... {self.omitted} bytes of output omitted ...]\n".encode()
+            data = bytes(self.head) + marker + tail
+        else:
+            data = bytes(self.head) + tail
+        return data.decode("utf-8", errors="replace")
+
+
+def pump(streams, deadline, until=None):
+    """
+    Reads the `streams` ({fd: BoundedOutput}) until they all reach EOF.
+
+    `until`, if given, is a (fd, callback) pair for an extra descriptor to
+    watch; the callback is invoked when it is readable and pumping continues
+    until the streams close. Returns False if `deadline` (a time.monotonic()
+    value) passed first.
+    """
+    selector = selectors.DefaultSelector()
+    for fd in streams:
+        os.set_blocking(fd, False)
+        selector.register(fd, selectors.EVENT_READ)
+    if until is not None:
+        selector.register(until[0], selectors.EVENT_READ)
+    open_streams = set(streams)
+    try:
+        while open_streams:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            for key, _ in selector.select(remaining):
+                fd = key.fd
+                if until is not None and fd == until[0]:
+                    if until[1]() is False:
+                        selector.unregister(fd)
+                    continue
+                try:
+                    data = os.read(fd, 65536)
+                except BlockingIOError:
+                    continue
+                if data:
+                    streams[fd].feed(data)
+                else:
+                    selector.unregister(fd)
+                    open_streams.discard(fd)
+        return True
+    finally:
+        selector.close()
@@ -0,0 +1,412 @@
+"""
+Warm Python workers for run_python_file.
+
+A worker is a long-lived interpreter (the "zygote") that imports the heavy
+analysis libraries once and then, for every request, forks a child which runs
+the target file with runpy in a fresh ``__main__`` namespace. The fork keeps
+runs isolated from each other while skipping interpreter start-up and the
+pandas/sklearn/hmmlearn/matplotlib import cost.
+
+Run ``python functions/python_worker.py --bench <file.py> [args...]`` to compare
+cold and warm latency for a script.
+"""
+import os
+import sys
+import json
+import time
+import queue
+import select
+import signal
+import socket
+import threading
+import subprocess
+
+if __package__:
+    from functions.output_capture import BoundedOutput, pump
+    from functions import sandbox
+else:  # started as a script by WarmWorker
+    from output_capture import BoundedOutput, pump
+    import sandbox
+
+# Imported by the zygote before it starts forking. Missing modules are skipped.
+WARM_MODULES = ["numpy", "pandas", "matplotlib.pyplot", "sklearn", "hmmlearn.hmm"]
+STARTUP_TIMEOUT = 60
+MESSAGE_TIMEOUT = 10
+
+
+class WorkerError(Exception):
+    """
+    The worker itself failed. Unless `started` is set the script never ran
+    and the caller can fall back to a cold run; once the worker has
+    acknowledged the request the script may have had side effects and must
+    not be run again.
+    """
+
+    def __init__(self, message, started=False):
+        super().__init__(message)
+        self.started = started
+
+
+def _run_child(request, fds, sock):
+    code = 1
+    try:
+        sock.close()
+        # Own process group so a timeout can kill anything the script spawns.
+        os.setpgid(0, 0)
+        devnull = os.open(os.devnull, os.O_RDONLY)
+        os.dup2(devnull, 0)
+        os.dup2(fds[0], 1)
+        os.dup2(fds[1], 2)
+        for fd in (devnull, *fds):
+            os.close(fd)
+        sandbox.apply_to_self(request["limits"])
+        os.environ.update(sandbox.thread_env(request["limits"], {}))
+        os.chdir(request["cwd"])
+        sys.argv = [request["file"]] + request["args"]
+        sys.path.insert(0, os.path.dirname(request["file"]))
+
+        # The zygote imported its helpers as top-level modules; a script's own
+        # sandbox.py or output_capture.py must not resolve to them.
+        for name in ("sandbox", "output_capture"):
+            sys.modules.pop(name, None)
+        # Every child is forked from the same zygote; without a reseed all warm
+        # runs would share one NumPy global RNG state (stdlib random reseeds
+        # itself after fork).
+        if "numpy" in sys.modules:
+            sys.modules["numpy"].random.seed()
+
+        import runpy
+        runpy.run_path(request["file"], run_name="__main__")
+        code = 0
+    except SystemExit as e:
+        if e.code is None or isinstance(e.code, int):
+            code = e.code or 0
+        else:
+            print(e.code, file=sys.stderr)
+            code = 1
+    except BaseException as e:
+        import traceback
+        # Hide the worker and runpy frames so tracebacks read like a cold run.
+        tb = e.__traceback__
+        while tb is not None and tb.tb_frame.f_code.co_filename != request["file"]:
+            tb = tb.tb_next
+        traceback.print_exception(type(e), e, tb or e.__traceback__)
+    finally:
+        try:
+            sys.stdout.flush()
+            sys.stderr.flush()
+        finally:
+            os._exit(code)
+
+
+def _resident_kb():
+    """Anonymous resident memory, i.e. the part a forked child inherits in its RSS."""
+    try:
+        with open("/proc/self/statm") as f:
+            fields = f.read().split()
+        pages = int(fields[1]) - int(fields[2])
+        return pages * os.sysconf("SC_PAGE_SIZE") // 1024
+    except (OSError, ValueError):
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def _serve(sock_fd):
+    os.environ.setdefault("MPLBACKEND", "Agg")
+    # Drop this file's directory so scripts cannot shadow-import the worker.
+    sys.path.pop(0)
+
+    import importlib
+    names = os.environ.get("FINAGENT_WARM_MODULES")
+    names = [n for n in names.split(",") if n] if names is not None else WARM_MODULES
+    loaded = []
+    for name in names:
+        try:
+            importlib.import_module(name)
+            loaded.append(name)
+        except Exception:
+            pass
+
+    # Requests arrive on a SEQPACKET socket together with the write ends of
+    # the caller's stdout/stderr pipes, so output streams straight to it.
+    sock = socket.socket(fileno=sock_fd)
+    sock.send(json.dumps({"ready": True, "modules": loaded}).encode())
+    while True:
+        message, fds, _, _ = socket.recv_fds(sock, 65536, 2)
+        if not message:
+            break
+        request = json.loads(message)
+        sys.stdout.flush()
+        sys.stderr.flush()
+        # A forked child starts with the zygote's resident pages, so its peak
+        # RSS includes the preloaded modules; runs report the growth above this.
+        preloaded_rss_kb = _resident_kb()
+        pid = os.fork()
+        if pid == 0:
+            _run_child(request, fds, sock)
+        for fd in fds:
+            os.close(fd)
+        try:
+            os.setpgid(pid, pid)
+        except OSError:
+            pass  # the child already did it, or has exited
+        sock.send(json.dumps({"pid": pid}).encode())
+        _, status, rusage = os.wait4(pid, 0)
+        sock.send(json.dumps({
+            "returncode": os.waitstatus_to_exitcode(status),
+            "cpu_time": rusage.ru_utime + rusage.ru_stime,
+            "max_rss_kb": max(rusage.ru_maxrss - preloaded_rss_kb, 0),
+            "preloaded_rss_kb": preloaded_rss_kb,
+        }).encode())
+
+
+class WarmWorker:
+    """Client side of one zygote process. Not thread-safe; see WarmWorkerPool."""
+
+    def __init__(self, python="python"):
+        self.sock, theirs = socket.socketpair(socket.AF_UNIX, socket.SOCK_SEQPACKET)
+        try:
+            self.proc = subprocess.Popen(
+                [python, os.path.abspath(__file__), "--serve", str(theirs.fileno())],
+                pass_fds=[theirs.fileno()],
+                # BLAS thread pools are sized when numpy is imported, i.e. in the zygote.
+                env=sandbox.thread_env(sandbox.default_limits()),
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+        finally:
+            theirs.close()
+        self._child = None
+        ready = self._recv(STARTUP_TIMEOUT)
+        if not ready or not ready.get("ready"):
+            self.close()
+            raise WorkerError("worker did not start")
+        self.modules = ready["modules"]
+
+    def _recv(self, timeout):
+        ready, _, _ = select.select([self.sock], [], [], max(timeout, 0))
+        if not ready:
+            return None
+        message = self.sock.recv(65536)
+        if not message:
+            raise WorkerError("worker exited unexpectedly")
+        return json.loads(message)
+
+    def run(self, target_file, args, cwd, timeout, echo=False, limits=None):
+        """Runs `target_file` in a forked child, streaming its output back through pipes."""
+        out_r, out_w = os.pipe()
+        err_r, err_w = os.pipe()
+        try:
+            request = {"file": target_file, "args": list(args), "cwd": cwd,
+                       "limits": limits if limits is not None else sandbox.default_limits()}
+            start = time.monotonic()
+            try:
+                socket.send_fds(self.sock, [json.dumps(request).encode()], [out_w, err_w])
+            except OSError as e:
+                raise WorkerError(f"cannot reach worker: {e}")
+            finally:
+                os.close(out_w)
+                os.close(err_w)
+            started = self._recv(MESSAGE_TIMEOUT)
+            if not started:
+                raise WorkerError("worker did not acknowledge the request")
+
+            self._child = started["pid"]
+            try:
+                return self._collect(started["pid"], out_r, err_r, start, timeout, echo)
+            except WorkerError as e:
+                self._kill_child()
+                raise WorkerError(str(e), started=True) from e
+        finally:
+            self._child = None
+            os.close(out_r)
+            os.close(err_r)
+
+    def _collect(self, pid, out_r, err_r, start, timeout, echo):
+        """Streams the child's output until it exits, killing it at the deadline."""
+        stdout = BoundedOutput(echo=sys.stdout.buffer if echo else None)
+        stderr = BoundedOutput(echo=sys.stderr.buffer if echo else None)
+        finished = {}
+
+        def on_message():
+            finished.update(self._recv(0) or {})
+            return False
+
+        streams = {out_r: stdout, err_r: stderr}
+        timed_out = not pump(streams, start + timeout, until=(self.sock.fileno(), on_message))
+        if timed_out:
+            try:
+                os.killpg(pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+            pump(streams, time.monotonic() + 1)
+        if not finished and not timed_out:
+            # Output reached EOF but the script may still be running with
+            # its stdio closed; the run deadline still applies.
+            finished = self._recv(start + timeout - time.monotonic())
+        if not finished:
+            timed_out = True
+            try:
+                os.killpg(pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+            finished = self._recv(MESSAGE_TIMEOUT)
+            if not finished:
+                raise WorkerError("worker did not report the exit status")
+        return {
+            "mode": "warm",
+            "returncode": finished["returncode"],
+            "stdout": stdout,
+            "stderr": stderr,
+            "timed_out": timed_out,
+            "wall_time": time.monotonic() - start,
+            "cpu_time": finished["cpu_time"],
+            "max_rss_kb": finished["max_rss_kb"],
+            "preloaded_rss_kb": finished["preloaded_rss_kb"],
+        }
+
+    def _kill_child(self):
+        if self._child is not None:
+            try:
+                os.killpg(self._child, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+            self._child = None
+
+    def close(self):
+        # The child runs in its own process group, so killing the zygote
+        # alone would leave it running.
+        self._kill_child()
+        self.sock.close()
+        try:
+            self.proc.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            self.proc.kill()
+            self.proc.wait()
+
+
+class WarmWorkerPool:
+    """Hands out idle workers, starting up to `size` of them on demand."""
+
+    def __init__(self, size=1, python="python"):
+        self.size = size
+        self.python = python
+        self._idle = queue.LifoQueue()
+        self._started = 0
+        self._lock = threading.Lock()
+
+    def prestart(self):
+        with self._lock:
+            if self._started:
+                return
+            self._started += 1
+        try:
+            self._idle.put(WarmWorker(self.python))
+        except Exception:
+            with self._lock:
+                self._started -= 1
+            raise
+
+    def _acquire(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            can_start = self._started < self.size
+            if can_start:
+                self._started += 1
+        if not can_start:
+            return self._idle.get()
+        try:
+            return WarmWorker(self.python)
+        except Exception:
+            with self._lock:
+                self._started -= 1
+            raise
+
+    def run(self, target_file, args, cwd, timeout, echo=False, limits=None):
+        worker = self._acquire()
+        try:
+            result = worker.run(target_file, args, cwd, timeout, echo, limits)
+        except WorkerError:
+            worker.close()
+            with self._lock:
+                self._started -= 1
+            raise
+        except BaseException:
+            self._idle.put(worker)
+            raise
+        self._idle.put(worker)
+        return result
+
+    def close(self):
+        while True:
+            try:
+                worker = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            worker.close()
+            with self._lock:
+                self._started -= 1
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def enable_warm_worker(size=1, prestart=True):
+    """Turns on warm execution for run_python_file, optionally starting a worker now."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = WarmWorkerPool(size)
+            import atexit
+            atexit.register(_pool.close)
+    if prestart:
+        try:
+            _pool.prestart()
+        except WorkerError:
+            pass
+    return _pool
+
+
+def get_pool():
+    """The active pool, or None if warm execution is disabled."""
+    if _pool is None and os.environ.get("FINAGENT_WARM_WORKER") == "1":
+        return enable_warm_worker(prestart=False)
+    return _pool
+
+
+def _bench(target_file, args, repeat=5):
+    target_file = os.path.abspath(target_file)
+    cwd = os.path.dirname(target_file)
+
+    def timed(fn):
+        samples = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            samples.append(time.perf_counter() - start)
+        return sorted(samples)[len(samples) // 2]
+
+    cold = timed(lambda: subprocess.run(["python", target_file] + args, capture_output=True, cwd=cwd))
+    pool = WarmWorkerPool()
+    start = time.perf_counter()
+    pool.prestart()
+    startup = time.perf_counter() - start
+    warm = timed(lambda: pool.run(target_file, args, cwd, timeout=300))
+    pool.close()
+    print(f"cold run (median of {repeat}): {cold:.3f}s")
+    print(f"warm run (median of {repeat}): {warm:.3f}s")
+    print(f"worker start-up (once):       {startup:.3f}s")
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["--serve"]:
+        _serve(int(sys.argv[2]))
+    elif sys.argv[1:2] == ["--bench"] and len(sys.argv) > 2:
+        _bench(sys.argv[2], sys.argv[3:])
+    else:
+        print("Usage: python functions/python_worker.py --bench <file.py> [args...]")
@@ -1,7 +1,122 @@
 import os
+import sys
+import json
+import time
+import signal
 import subprocess
 from google.genai import types
-def run_python_file(working_directory, file_path, args=None):
+from functions import sandbox
+from functions.output_capture import BoundedOutput, pump
+from functions.python_worker import WorkerError, get_pool
+
+TIMEOUT = 30
+
+
+def _reap(pid, deadline):
+    """
+    Waits for `pid` until `deadline`, killing its process group if it is
+    still running then. Returns (status, rusage, timed_out).
+    """
+    delay = 0.001
+    while True:
+        reaped, status, rusage = os.wait4(pid, os.WNOHANG)
+        if reaped:
+            return status, rusage, False
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        time.sleep(min(delay, remaining))
+        delay = min(delay * 2, 0.05)
+    try:
+        os.killpg(pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+    _, status, rusage = os.wait4(pid, 0)
+    return status, rusage, True
+
+
+def _run_cold(target_file, args, cwd, echo, limits):
+    """Runs the file in a fresh interpreter, streaming its output into bounded buffers."""
+    stdout = BoundedOutput(echo=sys.stdout.buffer if echo else None)
+    stderr = BoundedOutput(echo=sys.stderr.buffer if echo else None)
+    start = time.monotonic()
+    proc = subprocess.Popen(
+        ['python', target_file] + args,
+        cwd=cwd,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        start_new_session=True,
+        env=sandbox.thread_env(limits),
+        preexec_fn=sandbox.preexec_fn(limits),
+    )
+    sandbox.apply_to_pid(proc.pid, limits)
+    streams = {proc.stdout.fileno(): stdout, proc.stderr.fileno(): stderr}
+    try:
+        timed_out = not pump(streams, start + TIMEOUT)
+        if timed_out:
+            try:
+                os.killpg(proc.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+            pump(streams, time.monotonic() + 1)
+        # wait4 reaps the child and reports its resource usage in one call. The
+        # deadline still applies: a script can close stdout/stderr and keep running.
+        status, rusage, killed = _reap(proc.pid, start + TIMEOUT)
+        timed_out = timed_out or killed
+        proc.returncode = os.waitstatus_to_exitcode(status)
+    finally:
+        proc.stdout.close()
+        proc.stderr.close()
+    return {
+        "mode": "cold",
+        "returncode": proc.returncode,
+        "stdout": stdout,
+        "stderr": stderr,
+        "timed_out": timed_out,
+        "wall_time": time.monotonic() - start,
+        "cpu_time": rusage.ru_utime + rusage.ru_stime,
+        "max_rss_kb": rusage.ru_maxrss,
+    }
+
+
+def _run(target_file, args, cwd, echo=False):
+    """Runs the file in a warm worker when enabled, else in a fresh interpreter."""
+    limits = sandbox.default_limits()
+    pool = get_pool()
+    if pool is not None:
+        try:
+            return pool.run(target_file, args, cwd, TIMEOUT, echo, limits)
+        except WorkerError as e:
+            if e.started:
+                raise  # the script already ran; running it again could repeat its side effects
+            # otherwise fall back to a cold run below
+    return _run_cold(target_file, args, cwd, echo, limits)
+
+
+def _metrics(result):
+    metrics = {
+        "exit_code": result["returncode"],
+        "timed_out": result["timed_out"],
+        "mode": result["mode"],
+        "wall_time_s": round(result["wall_time"], 3),
+        "cpu_time_s": round(result["cpu_time"], 3),
+        "max_rss_mb": round(result["max_rss_kb"] / 1024, 1),
+        "stdout_bytes": result["stdout"].total,
+        "stderr_bytes": result["stderr"].total,
+    }
+    if "preloaded_rss_kb" in result:
+        # Warm runs report peak RSS above the worker's preloaded modules.
+        metrics["preloaded_rss_mb"] = round(result["preloaded_rss_kb"] / 1024, 1)
+    if result["returncode"] < 0:
+        try:
+            metrics["signal"] = signal.Signals(-result["returncode"]).name
+        except ValueError:
+            pass
+    return metrics
+
+
+def run_python_file(working_directory, file_path, args=None, echo=False):
     try: 
         abs_working_dir = os.path.abspath(working_directory)
         target_file = os.path.normpath(os.path.join(abs_working_dir, file_path))
@@ -16,20 +131,20 @@ def run_python_file(working_directory, file_path, args=None):
         if not file_path.endswith('.py'):
             return f'Error: "{file_path}" is not a Python file'
         
-        command = ['python', target_file]
-        if args is not None:
-            command.extend(args)
         ans = ""
-        result = subprocess.run(command, capture_output=True, cwd=abs_working_dir, text=True, timeout=30)
-        if result.returncode != 0:
-            ans+= f"Process exited with code {result.returncode}"
-        if not result.stderr and not result.stdout:
+        result = _run(target_file, list(args or []), abs_working_dir, echo)
+        if result["timed_out"]:
+            ans+= f"Process timed out after {TIMEOUT} seconds and was killed; partial output follows"
+        elif result["returncode"] != 0:
+            ans+= f"Process exited with code {result['returncode']}"
+        if not result["stderr"].total and not result["stdout"].total:
             ans+= "No output produced"
         else:
             ans+= f"""
-STDOUT: {result.stdout}
-STDERR: {result.stderr}
+STDOUT: {result["stdout"].text()}
+STDERR: {result["stderr"].text()}
         """
+        ans += f"\nMETRICS: {json.dumps(_metrics(result))}"
         return ans
     except Exception as e:
         return f"Error: executing Python file: {e}"
@@ -0,0 +1,103 @@
+"""
+Resource limits for scripts run by run_python_file.
+
+Limits come from environment variables and 0 means unlimited:
+
+    FINAGENT_CPU_SECONDS   CPU time per run (default 120)
+    FINAGENT_MEMORY_MB     address space per process (default 4096)
+    FINAGENT_OPEN_FILES    open file descriptors (default 256)
+    FINAGENT_THREADS       BLAS/OpenMP thread pool size (default 4)
+
+The rlimits need the `resource` module and are skipped where it is missing.
+"""
+import os
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+# Honoured by OpenBLAS, MKL, OpenMP, numexpr and Accelerate respectively.
+THREAD_ENV_VARS = (
+    "OMP_NUM_THREADS",
+    "OPENBLAS_NUM_THREADS",
+    "MKL_NUM_THREADS",
+    "NUMEXPR_NUM_THREADS",
+    "VECLIB_MAXIMUM_THREADS",
+)
+
+
+def _env_int(name, default):
+    value = os.environ.get(name)
+    return int(value) if value else default
+
+
+def default_limits():
+    return {
+        "cpu_seconds": _env_int("FINAGENT_CPU_SECONDS", 120),
+        "memory_mb": _env_int("FINAGENT_MEMORY_MB", 4096),
+        "open_files": _env_int("FINAGENT_OPEN_FILES", 256),
+        "threads": _env_int("FINAGENT_THREADS", 4),
+    }
+
+
+def thread_env(limits, base=None):
+    """A copy of `base` (default os.environ) with the thread-count variables capped."""
+    env = dict(os.environ if base is None else base)
+    if limits.get("threads"):
+        for name in THREAD_ENV_VARS:
+            env[name] = str(limits["threads"])
+    return env
+
+
+def _rlimits(limits):
+    if resource is None:
+        return []
+    pairs = []
+    if limits.get("cpu_seconds"):
+        # The soft limit sends SIGXCPU; the hard one a few seconds later SIGKILL.
+        seconds = limits["cpu_seconds"]
+        pairs.append((resource.RLIMIT_CPU, (seconds, seconds + 5)))
+    if limits.get("memory_mb"):
+        size = limits["memory_mb"] * 1024 * 1024
+        pairs.append((resource.RLIMIT_AS, (size, size)))
+    if limits.get("open_files"):
+        pairs.append((resource.RLIMIT_NOFILE, (limits["open_files"], limits["open_files"])))
+    # Children inherit our limits and cannot raise a hard limit, so clamp to it.
+    clamped = []
+    for which, (soft, hard) in pairs:
+        current_hard = resource.getrlimit(which)[1]
+        if current_hard != resource.RLIM_INFINITY:
+            soft, hard = min(soft, current_hard), min(hard, current_hard)
+        clamped.append((which, (soft, hard)))
+    return clamped
+
+
+def apply_to_self(limits):
+    """Applies the limits to the calling process (a forked child or preexec_fn)."""
+    for which, value in _rlimits(limits):
+        resource.setrlimit(which, value)
+
+
+def apply_to_pid(pid, limits):
+    """
+    Applies the limits to an already started child.
+
+    Uses prlimit(2) where available, which unlike preexec_fn is safe to call
+    from a multi-threaded parent. Returns False if it could not be applied.
+    """
+    if resource is None or not hasattr(resource, "prlimit"):
+        return False
+    try:
+        for which, value in _rlimits(limits):
+            resource.prlimit(pid, which, value)
+    except ProcessLookupError:
+        pass  # already exited
+    return True
+
+
+def preexec_fn(limits):
+    """Fallback for platforms without prlimit; None if there is nothing to apply."""
+    if resource is None or hasattr(resource, "prlimit") or not _rlimits(limits):
+        return None
+    return lambda: apply_to_self(limits)
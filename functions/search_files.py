@@ -0,0 +1,267 @@
+import os
+import re
+from google.genai import types
+from functions.get_files_info import DEFAULT_IGNORE, matches_any
+
+try:
+    import re._parser as sre_parse
+except ImportError:  # pragma: no cover - only on interpreters without the private parser
+    sre_parse = None
+
+MAX_RESULTS = 50
+MAX_LINE_CHARS = 200
+# Files above this size are not indexed; they are always treated as candidates.
+MAX_INDEX_BYTES = 1_000_000
+
+
+def _trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def _is_text(head):
+    return b"\0" not in head
+
+
+class TrigramIndex:
+    """
+    Inverted index from lowercased trigrams to the files containing them.
+
+    The index is built lazily on the first search of a working directory and
+    kept current by `update` (called after writes) or a stat-based `refresh`
+    when the tree may have been modified by other means.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self.files = {}  # rel_path -> ((mtime_ns, size), trigrams or None)
+        self.postings = {}  # trigram -> set of rel_paths
+        self.built = False
+        self.dirty = False
+
+    def _iter_files(self):
+        for dirpath, dirnames, filenames in os.walk(self.root):
+            rel_dir = os.path.relpath(dirpath, self.root)
+            rel_dir = "" if rel_dir == "." else rel_dir
+            dirnames[:] = sorted(
+                d for d in dirnames
+                if not matches_any(DEFAULT_IGNORE, d, os.path.join(rel_dir, d), True)
+            )
+            for name in sorted(filenames):
+                rel_path = os.path.join(rel_dir, name)
+                if not matches_any(DEFAULT_IGNORE, name, rel_path, False):
+                    yield rel_path
+
+    def _remove(self, rel_path):
+        entry = self.files.pop(rel_path, None)
+        if entry is not None and entry[1]:
+            for trigram in entry[1]:
+                paths = self.postings.get(trigram)
+                if paths is not None:
+                    paths.discard(rel_path)
+                    if not paths:
+                        del self.postings[trigram]
+
+    def update(self, rel_path):
+        """(Re)indexes a single file, or drops it if it no longer exists."""
+        self._remove(rel_path)
+        abs_path = os.path.join(self.root, rel_path)
+        try:
+            st = os.stat(abs_path)
+            if st.st_size > MAX_INDEX_BYTES:
+                self.files[rel_path] = ((st.st_mtime_ns, st.st_size), None)
+                return
+            with open(abs_path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return
+        if not _is_text(data[:8192]):
+            return
+        trigrams = _trigrams(data.decode("utf-8", errors="replace").lower())
+        self.files[rel_path] = ((st.st_mtime_ns, st.st_size), trigrams)
+        for trigram in trigrams:
+            self.postings.setdefault(trigram, set()).add(rel_path)
+
+    def refresh(self):
+        """Reindexes only the files whose (mtime, size) changed since the last scan."""
+        seen = set()
+        for rel_path in self._iter_files():
+            seen.add(rel_path)
+            try:
+                st = os.stat(os.path.join(self.root, rel_path))
+            except OSError:
+                continue
+            entry = self.files.get(rel_path)
+            if entry is None or entry[0] != (st.st_mtime_ns, st.st_size):
+                self.update(rel_path)
+        for rel_path in set(self.files) - seen:
+            self._remove(rel_path)
+        self.built = True
+        self.dirty = False
+
+    def ensure_current(self):
+        if not self.built or self.dirty:
+            self.refresh()
+
+    def candidates(self, literals):
+        """Files that may contain every literal; all files if none is usable."""
+        selected = None
+        for literal in literals:
+            for trigram in _trigrams(literal.lower()):
+                paths = self.postings.get(trigram, set())
+                selected = set(paths) if selected is None else selected & paths
+        unindexed = {p for p, (_, trigrams) in self.files.items() if trigrams is None}
+        if selected is None:
+            return sorted(self.files)
+        return sorted(selected | unindexed)
+
+
+_indexes = {}
+
+
+def get_index(working_directory):
+    root = os.path.abspath(working_directory)
+    if root not in _indexes:
+        _indexes[root] = TrigramIndex(root)
+    return _indexes[root]
+
+
+def notify_file_changed(working_directory, file_path):
+    """Keeps an already built index in sync after a tool modified `file_path`."""
+    index = _indexes.get(os.path.abspath(working_directory))
+    if index is not None and index.built:
+        abs_path = os.path.normpath(os.path.join(index.root, file_path))
+        index.update(os.path.relpath(abs_path, index.root))
+
+
+def mark_dirty(working_directory):
+    """Forces a stat-based refresh before the next search, e.g. after running code."""
+    index = _indexes.get(os.path.abspath(working_directory))
+    if index is not None:
+        index.dirty = True
+
+
+def _required_literals(pattern):
+    """Literal runs every match of `pattern` must contain, or [] if unknown."""
+    if sre_parse is None:
+        return []
+    try:
+        parsed = sre_parse.parse(pattern)
+    except re.error:
+        return []
+    literals, run = [], []
+    for op, arg in parsed:
+        if op is sre_parse.LITERAL:
+            run.append(chr(arg))
+            continue
+        if op is sre_parse.BRANCH:
+            return []
+        if run:
+            literals.append("".join(run))
+            run = []
+    if run:
+        literals.append("".join(run))
+    return [literal for literal in literals if len(literal) >= 3]
+
+
+def search_files(working_directory, pattern, regex=False, case_sensitive=True, path=".",
+                 include=None, context=0, max_results=MAX_RESULTS):
+    abs_working_dir = os.path.abspath(working_directory)
+    target = os.path.normpath(os.path.join(abs_working_dir, path))
+
+    if os.path.commonpath([target, abs_working_dir]) != abs_working_dir:
+        return f'Error: Cannot search "{path}" as it is outside the permitted working directory'
+    if not os.path.exists(target):
+        return f'Error: "{path}" does not exist'
+    if not pattern:
+        return "Error: pattern must not be empty"
+
+    source = pattern if regex else re.escape(pattern)
+    try:
+        compiled = re.compile(source, 0 if case_sensitive else re.IGNORECASE)
+    except re.error as e:
+        return f'Error: invalid regular expression "{pattern}": {e}'
+    literals = _required_literals(source) if regex else [pattern]
+    context = max(0, min(int(context), 5))
+    max_results = int(max_results)
+
+    index = get_index(abs_working_dir)
+    index.ensure_current()
+    rel_target = os.path.relpath(target, abs_working_dir)
+    prefix = "" if rel_target == "." else rel_target + os.sep
+
+    out = []
+    matches = 0
+    for rel_path in index.candidates(literals):
+        if prefix and not (rel_path + os.sep).startswith(prefix) and rel_path != rel_target:
+            continue
+        if include and not matches_any(include, os.path.basename(rel_path), rel_path, False):
+            continue
+        try:
+            with open(os.path.join(abs_working_dir, rel_path), "rb") as f:
+                data = f.read()
+        except OSError:
+            continue
+        if not _is_text(data[:8192]):
+            continue
+        lines = data.decode("utf-8", errors="replace").splitlines()
+        last_printed = -1
+        for i, line in enumerate(lines):
+            if not compiled.search(line):
+                continue
+            if matches >= max_results:
+                out.append(f"[...results truncated at {max_results} matches]")
+                return "\n".join(out)
+            matches += 1
+            start = max(i - context, last_printed + 1)
+            if context and out and start > last_printed + 1:
+                out.append("--")
+            for j in range(start, min(i + context, len(lines) - 1) + 1):
+                if j <= last_printed:
+                    continue
+                sep = ":" if compiled.search(lines[j]) else "-"
+                out.append(f"{rel_path}{sep}{j + 1}{sep} {lines[j][:MAX_LINE_CHARS]}")
+                last_printed = j
+
+    if not out:
+        return f'No matches for "{pattern}"'
+    return "\n".join(out)
+
+schema_search_files = types.FunctionDeclaration(
+    name="search_files",
+    description="Searches file contents under the working directory for a literal string or regular expression and returns matching lines as path:line: text",
+    parameters=types.Schema(
+        type=types.Type.OBJECT,
+        properties={
+            "pattern": types.Schema(
+                type=types.Type.STRING,
+                description="Text to search for; treated as a Python regular expression when regex is true",
+            ),
+            "regex": types.Schema(
+                type=types.Type.BOOLEAN,
+                description="Interpret pattern as a regular expression (default false)",
+            ),
+            "case_sensitive": types.Schema(
+                type=types.Type.BOOLEAN,
+                description="Match case exactly (default true)",
+            ),
+            "path": types.Schema(
+                type=types.Type.STRING,
+                description="File or directory to search, relative to the working directory (default the whole working directory)",
+            ),
+            "include": types.Schema(
+                type=types.Type.ARRAY,
+                description="Glob patterns files must match to be searched, e.g. ['*.py']",
+                items=types.Schema(type=types.Type.STRING),
+            ),
+            "context": types.Schema(
+                type=types.Type.INTEGER,
+                description="Number of lines of context to show around each match (default 0, max 5)",
+            ),
+            "max_results": types.Schema(
+                type=types.Type.INTEGER,
+                description=f"Maximum number of matching lines to return (default {MAX_RESULTS})",
+            ),
+        },
+        required=["pattern"],
+    ),
+)
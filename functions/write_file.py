@@ -1,6 +1,35 @@
 import os
+import shutil
+import tempfile
 from google.genai import types
 
+# Read once at import: os.umask can only be queried by setting it, which is
+# not safe once tool calls run on several threads.
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def atomic_write(target_file, content):
+    """
+    Writes `content` to a temp file beside `target_file` and renames it over it.
+
+    Readers never see a half-written file, and a hard link to the old file
+    (e.g. in a workspace snapshot) keeps pointing at the old contents.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(target_file), prefix=".write-")
+    try:
+        with os.fdopen(fd, "w", newline="") as f:
+            f.write(content)
+        if os.path.exists(target_file):
+            shutil.copymode(target_file, tmp_path)
+        else:
+            os.chmod(tmp_path, 0o666 & ~_UMASK)
+        os.replace(tmp_path, target_file)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
 def write_file(working_directory, file_path, content):
     abs_working_dir = os.path.abspath(working_directory)
     target_file = os.path.normpath(os.path.join(abs_working_dir, file_path))
@@ -12,8 +41,7 @@ def write_file(working_directory, file_path, content):
         return f'Error: Cannot write to "{file_path}" as it is a directory'
     
     os.makedirs(os.path.dirname(target_file), exist_ok=True)
-    with open(target_file, 'w') as f:
-        f.write(content)
+    atomic_write(target_file, content)
     return f'Successfully wrote to "{file_path}" ({len(content)} characters written)'
     
 schema_write_file = types.FunctionDeclaration(
@@ -1,30 +1,69 @@
 import os
+import time
 from dotenv import load_dotenv
-from google import genai
-from google.genai import types
 import argparse
 from prompts import system_prompt
-from call_functions import available_functions, call_function
+from call_functions import call_function, WORKING_DIRECTORY
+from functions.python_worker import enable_warm_worker
+from tracing import Tracer, ReplayClient, load_trace, payload_size
+from workspace import Snapshot, METHODS
 import sys
 
-def call_agent(client, args):
+MODEL = 'gemini-2.5-flash'
+
+def call_agent(client, args, tracer=None, working_directory=WORKING_DIRECTORY, cache=None, stats=None):
+    """
+    Runs the agent loop for args.user_prompt and returns 0 on success, 1 otherwise.
+
+    `cache` defaults to the process-wide tool cache. If `stats` is a dict it
+    is filled with the final response text, iteration count and token totals.
+    """
+    from google.genai import types
+    from call_functions import available_functions
 
     max_iters = 20
+    if stats is None:
+        stats = {}
+    stats.update(final_text=None, iterations=0, prompt_tokens=0, response_tokens=0)
+    tool_kwargs = {"working_directory": working_directory}
+    if cache is not None:
+        tool_kwargs["cache"] = cache
+    session_start = time.perf_counter()
+    if tracer is not None:
+        tracer.record("session", prompt=args.user_prompt, model=MODEL)
 
     messages = [types.Content(role="user", parts=[types.Part(text=args.user_prompt)])]
+    status = 1
     for i in range(max_iters):
         config=types.GenerateContentConfig(
             tools=[available_functions], 
             system_instruction=system_prompt
         )
+        call_start = time.perf_counter()
         response = client.models.generate_content(
-            model='gemini-2.5-flash',
+            model=MODEL,
             contents = messages,
             config=config
         )
+        if tracer is not None:
+            usage = response.usage_metadata
+            tracer.record(
+                "model_call",
+                iteration=i,
+                duration_s=round(time.perf_counter() - call_start, 6),
+                prompt_tokens=usage.prompt_token_count if usage else None,
+                response_tokens=usage.candidates_token_count if usage else None,
+                request_messages=len(messages),
+                request_bytes=payload_size(messages),
+                response_bytes=payload_size(response),
+                response=response.model_dump(mode="json", exclude_none=True),
+            )
+        stats["iterations"] = i + 1
         if response.usage_metadata is None:
             print("Response is None")
             break
+        stats["prompt_tokens"] += response.usage_metadata.prompt_token_count or 0
+        stats["response_tokens"] += response.usage_metadata.candidates_token_count or 0
 
         if args.verbose:
             print(f'Prompt tokens: {response.usage_metadata.prompt_token_count}')
@@ -39,12 +78,12 @@ def call_agent(client, args):
                 print(
                     f"Calling function: {function_call.name} "
                     f"{[
-                        f'{k}: {v[:100] + "..." if len(v) > 100 else v}'
-                        for k, v in function_call.args.items()
+                        f'{k}: {str(v)[:100] + "..." if len(str(v)) > 100 else v}'
+                        for k, v in (function_call.args or {}).items()
                     ]}"
                 )
 
-                function_call_result = call_function(function_call, verbose=args.verbose)
+                function_call_result = call_function(function_call, verbose=args.verbose, tracer=tracer, **tool_kwargs)
                 messages.append(function_call_result)
 
                 if not (function_call_result.parts):
@@ -61,22 +100,78 @@ def call_agent(client, args):
                     print(f"-> {function_call_result.parts[0].function_response.response}")                   
         else:
             print(response.text)
-            return 0
-    return 1
+            stats["final_text"] = response.text
+            status = 0
+            break
+    if tracer is not None:
+        tracer.record("session_end", status=status, iterations=i + 1,
+                      duration_s=round(time.perf_counter() - session_start, 6))
+    return status
 
 def main():
     load_dotenv()
 
-    api_key = os.environ.get("GEMINI_API_KEY")
-    if api_key is None:
-        raise RuntimeError("No Key found")
-    client = genai.Client(api_key=api_key)
     parser = argparse.ArgumentParser(description="Chatbot")
-    parser.add_argument("user_prompt", type=str, help="User prompt")
+    parser.add_argument("user_prompt", type=str, nargs="?", help="User prompt (optional with --replay)")
     parser.add_argument("--verbose", action="store_true", help="Enable verbose output")
+    parser.add_argument("--warm-worker", action="store_true",
+                        help="Run python files in a pre-forked interpreter with heavy modules already imported")
+    parser.add_argument("--trace", metavar="PATH", help="Write a JSONL trace of model and tool calls to PATH")
+    parser.add_argument("--replay", metavar="PATH",
+                        help="Replay the model responses recorded in a trace instead of calling the API")
+    parser.add_argument("--working-directory", default=WORKING_DIRECTORY,
+                        help=f"Directory the agent's tools operate in (default {WORKING_DIRECTORY})")
+    parser.add_argument("--snapshot", choices=["discard", "commit", "keep"],
+                        help="Work in a copy-on-write snapshot of the working directory and discard, "
+                             "commit or keep its changes at the end")
+    parser.add_argument("--snapshot-method", choices=METHODS, default="auto",
+                        help="How snapshot files are cloned (default: reflink if supported, else copy)")
     args = parser.parse_args()
-    res = call_agent(client, args)
+
+    if args.replay:
+        client = ReplayClient(load_trace(args.replay))
+        if args.user_prompt is None:
+            args.user_prompt = client.prompt
+    else:
+        api_key = os.environ.get("GEMINI_API_KEY")
+        if api_key is None:
+            raise RuntimeError("No Key found")
+        from google import genai
+
+        client = genai.Client(api_key=api_key)
+    if args.user_prompt is None:
+        parser.error("user_prompt is required")
+    if args.warm_worker:
+        enable_warm_worker()
+
+    working_directory = args.working_directory
+    snapshot = None
+    if args.snapshot:
+        snapshot = Snapshot.create(working_directory, method=args.snapshot_method)
+        working_directory = snapshot.path
+        print(f"Working in {snapshot.method} snapshot {snapshot.path}")
+
+    tracer = Tracer(args.trace) if args.trace else None
+    try:
+        res = call_agent(client, args, tracer, working_directory=working_directory)
+    finally:
+        if tracer is not None:
+            tracer.close()
+        if snapshot is not None:
+            _finish_snapshot(snapshot, args.snapshot)
     sys.exit(res)
+
+def _finish_snapshot(snapshot, action):
+    if action == "commit":
+        changes = snapshot.commit()
+        snapshot.discard()
+    else:
+        changes = snapshot.changes()
+        if action == "discard":
+            snapshot.discard()
+    summary = ", ".join(f"{len(v)} {k}" for k, v in changes.items())
+    print(f"Snapshot {action}: {summary}" + (f" (kept at {snapshot.path})" if action == "keep" else ""))
     
 
-main()
\ No newline at end of file
+if __name__ == "__main__":
+    main()
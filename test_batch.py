@@ -0,0 +1,45 @@
+import json
+import os
+import tempfile
+from google.genai import types
+from batch import load_tasks, run_batch
+
+
+class ScriptedModels:
+    """Lists the workspace on the first turn and answers on the second."""
+
+    def generate_content(self, model=None, contents=None, config=None):
+        if len(contents) == 1:
+            parts = [types.Part(function_call=types.FunctionCall(name="get_files_info", args={}))]
+        else:
+            parts = [types.Part(text=f"Done: {contents[0].parts[0].text}")]
+        return types.GenerateContentResponse(
+            candidates=[types.Candidate(content=types.Content(role="model", parts=parts))],
+            usage_metadata=types.GenerateContentResponseUsageMetadata(prompt_token_count=10, candidates_token_count=5),
+        )
+
+
+class ScriptedClient:
+    models = ScriptedModels()
+
+
+work = tempfile.mkdtemp()
+tasks_path = os.path.join(work, "tasks.jsonl")
+with open(tasks_path, "w") as f:
+    for n in range(3):
+        f.write(json.dumps({"id": f"task-{n}", "prompt": f"list files {n}"}) + "\n")
+    f.write(json.dumps({"request_id": "req-9", "title": "Title", "body": "Body"}) + "\n")
+
+output = os.path.join(work, "results.jsonl")
+print(run_batch(ScriptedClient(), load_tasks(tasks_path), output, "calculator", concurrency=2,
+                root=os.path.join(work, "workspaces")))
+for line in sorted(open(output)):
+    record = json.loads(line)
+    print(record["id"], record["status"], record["final_text"], record["prompt_tokens"], os.path.isdir(record["workspace"]))
+
+# Repeated ids get their own workspace and log.
+dup_path = os.path.join(work, "dups.jsonl")
+with open(dup_path, "w") as f:
+    for n in range(3):
+        f.write(json.dumps({"id": "same", "prompt": f"dup {n}"}) + "\n")
+print([task["id"] for task in load_tasks(dup_path)])
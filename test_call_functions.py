@@ -0,0 +1,26 @@
+import os
+from google.genai import types
+from call_functions import call_function, session_cache
+
+
+def result_of(name, **args):
+    content = call_function(types.FunctionCall(name=name, args=args))
+    return content.parts[0].function_response.response["result"]
+
+
+path = os.path.join("agents_first_project", "test.txt")
+original = open(path).read()
+
+session_cache.clear()
+print(result_of("get_file_content", file_path="test.txt")[:60])
+print(result_of("get_file_content", file_path="test.txt"))
+print(result_of("get_files_info", directory="."))
+print(result_of("get_files_info", directory="."))
+print(result_of("write_file", file_path="test.txt", content=original + "\n"))
+print(result_of("get_file_content", file_path="test.txt")[:60])
+print(result_of("get_files_info", directory=".")[:60])
+print(result_of("get_file_content", file_path="does_not_exist.txt"))
+print(result_of("get_file_content", file_path="does_not_exist.txt"))
+
+with open(path, "w") as f:
+    f.write(original)
@@ -0,0 +1,46 @@
+import os
+import tempfile
+from functions.edit_file import edit_file
+
+work = tempfile.mkdtemp()
+with open(os.path.join(work, "sample.py"), "w") as f:
+    f.write("def add(a, b):\n    return a - b\n\n\nprint(add(2, 3))\n")
+
+print(edit_file(work, "sample.py", edits=[{"old_string": "a - b", "new_string": "a + b"}]))
+print(edit_file(work, "sample.py", diff="""--- a/sample.py
++++ b/sample.py
+@@ -4,2 +4,3 @@
+ 
+-print(add(2, 3))
++print(add(2, 3))
++print(add(4, 5))
+"""))
+print(open(os.path.join(work, "sample.py")).read())
+print(edit_file(work, "sample.py", edits=[{"old_string": "add", "new_string": "plus"}]))
+print(edit_file(work, "sample.py", edits=[{"old_string": "missing", "new_string": "x"}]))
+print(edit_file(work, "sample.py", diff="@@ -1,1 +1,1 @@\n-nothing like this\n+x\n"))
+print(edit_file(work, "../sample.py", edits=[{"old_string": "a", "new_string": "b"}]))
+print(os.listdir(work))
+
+# Form feeds and other splitlines() separators stay inside their line.
+with open(os.path.join(work, "ff.txt"), "w", newline="") as f:
+    f.write("a\r\nx\x0cy\r\nb\r\nc")
+print(edit_file(work, "ff.txt", diff="@@ -2,3 +2,3 @@\n x\x0cy\n-b\n+B\n c\n"))
+print(repr(open(os.path.join(work, "ff.txt"), newline="").read()))
+
+# A trailing blank line after the last hunk is not context.
+with open(os.path.join(work, "vars.py"), "w") as f:
+    f.write("x = 1\ny = 2\n")
+print(edit_file(work, "vars.py", diff="@@ -1,2 +1,2 @@\n x = 1\n-y = 2\n+y = 3\n\n"))
+print(repr(open(os.path.join(work, "vars.py")).read()))
+
+with open(os.path.join(work, "latin1.txt"), "wb") as f:
+    f.write(b"caf\xe9\n")
+print(edit_file(work, "latin1.txt", edits=[{"old_string": "caf", "new_string": "tea"}]))
+
+# A pure insertion (old count 0, as diff -U0 emits) goes after line old_start.
+with open(os.path.join(work, "numbers.txt"), "w") as f:
+    f.write("1\n2\n3\n4\n5\n")
+print(edit_file(work, "numbers.txt", diff="@@ -2,0 +3 @@\n+inserted\n"))
+print(edit_file(work, "numbers.txt", diff="@@ -0,0 +1 @@\n+first\n"))
+print(open(os.path.join(work, "numbers.txt")).read().split())
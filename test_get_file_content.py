@@ -4,4 +4,24 @@ print(get_file_content("calculator", "lorem.txt"))
 print(get_file_content("calculator", "main.py"))
 print(get_file_content("calculator", "pkg/calculator.py"))
 print(get_file_content("calculator", "/bin/cat"))
-print(get_file_content("calculator", "pkg/does_not_exist.py"))
\ No newline at end of file
+print(get_file_content("calculator", "pkg/does_not_exist.py"))
+print(get_file_content("calculator", "pkg/calculator.py", offset=18, limit=5))
+print(get_file_content("calculator", "pkg/calculator.py", offset=0, limit=40, unit="bytes"))
+print(get_file_content("calculator", "main.py", offset=1000))
+
+import os
+import tempfile
+
+work = tempfile.mkdtemp()
+with open(os.path.join(work, "minified.json"), "w") as f:
+    f.write('{"values": [' + ",".join(["1.5"] * 500000) + "]}")
+result = get_file_content(work, "minified.json")
+print(len(result), result[-110:])
+print(get_file_content(work, "minified.json", offset=9992, limit=20, unit="bytes"))
+
+with open(os.path.join(work, "two.txt"), "w") as f:
+    f.write("one\ntwo\n")
+print(get_file_content(work, "two.txt", offset=2))
+print(get_file_content(work, "two.txt", offset=3))
+assert get_file_content(work, "two.txt", offset=3).startswith("Error:")
+assert get_file_content(work, "two.txt", offset=0, limit=2, unit="bytes") == 'on\n[...File "two.txt" has 8 bytes; continue with offset=2]'
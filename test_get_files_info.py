@@ -3,4 +3,15 @@ from functions.get_files_info import get_files_info
 print(get_files_info("calculator", "."))
 print(get_files_info("calculator", "pkg"))
 print(get_files_info("calculator", "/bin"))
-print(get_files_info("calculator", "../"))
\ No newline at end of file
+print(get_files_info("calculator", "../"))
+print(get_files_info("calculator", ".", recursive=True))
+print(get_files_info("calculator", ".", recursive=True, include=["*.py"]))
+print(get_files_info("calculator", ".", recursive=True, max_depth=0, max_entries=3))
+
+import os
+import tempfile
+
+work = tempfile.mkdtemp()
+os.makedirs(os.path.join(work, "sub"))
+os.symlink("/etc", os.path.join(work, "sub", "etc_link"))
+print(get_files_info(work, ".", recursive=True))
@@ -1,6 +1,8 @@
-
 from functions.install_packages import install_packages
 
 
+print(install_packages(['some_invalid_package']))
 print(install_packages(['some_invalid_package']))
 print(install_packages(['pandas', 'numpy']))
+print(install_packages(['numpy>=1.0', 'numpy>=1.0']))
+print(install_packages(['some_other_missing_package'], offline=True))
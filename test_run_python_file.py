@@ -1,8 +1,53 @@
+import os
+import tempfile
+from functions import run_python_file as run_module
 from functions.run_python_file import run_python_file
 
+# A script that closes its stdio and keeps running must still hit the deadline.
+silent_dir = tempfile.mkdtemp()
+with open(os.path.join(silent_dir, "silent.py"), "w") as f:
+    f.write("import os, time\nos.close(1)\nos.close(2)\ntime.sleep(10)\n")
+run_module.TIMEOUT = 2
+print(run_python_file(silent_dir, "silent.py"))
+run_module.TIMEOUT = 30
+
 print(run_python_file("calculator", "main.py"))
 print(run_python_file("calculator", "main.py", ["3 + 5"]) )
 print(run_python_file("calculator", "tests.py") )
 print(run_python_file("calculator", "../main.py") )
 print(run_python_file("calculator", "nonexistent.py") )
-print(run_python_file("calculator", "lorem.txt") )
\ No newline at end of file
+print(run_python_file("calculator", "lorem.txt") )
+from functions.python_worker import enable_warm_worker
+
+enable_warm_worker()
+print(run_python_file("calculator", "main.py", ["3 + 5"]) )
+print(run_python_file("calculator", "tests.py") )
+run_module.TIMEOUT = 2
+print(run_python_file(silent_dir, "silent.py"))
+run_module.TIMEOUT = 30
+
+# Warm runs are forked from one zygote but must not share RNG state or see
+# the worker's own helper modules in place of the script's.
+with open(os.path.join(silent_dir, "rand.py"), "w") as f:
+    f.write("import numpy as np\nprint(np.random.rand())\n")
+draws = [run_python_file(silent_dir, "rand.py").split("STDOUT: ")[1].split()[0] for _ in range(3)]
+print(len(set(draws)) == 3, draws)
+with open(os.path.join(silent_dir, "sandbox.py"), "w") as f:
+    f.write("print('mine')\n")
+with open(os.path.join(silent_dir, "uses_sandbox.py"), "w") as f:
+    f.write("import sandbox\n")
+print(run_python_file(silent_dir, "uses_sandbox.py"))
+
+# If the worker dies after acknowledging a run, the script is not rerun cold
+# and its child process is killed.
+import threading
+import time
+from functions.python_worker import get_pool
+
+with open(os.path.join(silent_dir, "marker.py"), "w") as f:
+    f.write("import time\nopen('runs.txt', 'a').write('start\\n')\ntime.sleep(1)\nopen('runs.txt', 'a').write('end\\n')\n")
+worker = get_pool()._idle.queue[-1]
+threading.Timer(0.5, worker.proc.kill).start()
+print(run_python_file(silent_dir, "marker.py"))
+time.sleep(1.5)
+print(open(os.path.join(silent_dir, "runs.txt")).read().split())
@@ -0,0 +1,9 @@
+from functions.search_files import search_files
+
+print(search_files("calculator", "evaluate"))
+print(search_files("calculator", r"def \w+_operator", regex=True, context=1))
+print(search_files("calculator", "CALCULATOR", case_sensitive=False, include=["*.py"]))
+print(search_files("calculator", "lorem", path="pkg"))
+print(search_files("calculator", "no such text anywhere"))
+print(search_files("calculator", "[unclosed", regex=True))
+print(search_files("calculator", "import", path="../"))
@@ -0,0 +1,40 @@
+import os
+import sys
+import subprocess
+
+# Cumulative import time budgets in milliseconds, measured with -X importtime.
+# The agent CLI must not pay for google.genai before it needs a client; the
+# analysis scripts must not load hmmlearn, sklearn or plotting until used.
+BUDGETS_MS = {"main": 250, "batch": 250}
+HEAVY_MODULES = {
+    "main": ["google.genai", "functions.run_python_file"],
+    "batch": ["google.genai"],
+    "hmm_model": ["hmmlearn", "sklearn", "matplotlib.pyplot"],
+    "directional_change_detection": ["hmmlearn", "sklearn", "matplotlib.pyplot"],
+    "stock_analyzer": ["matplotlib.pyplot", "mplfinance"],
+}
+BUDGET_SCALE = float(os.environ.get("FINAGENT_STARTUP_BUDGET_SCALE", "1"))
+
+
+def import_times(module, cwd):
+    """Maps each module imported by `import module` to its cumulative import time in ms."""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            cwd=cwd, capture_output=True, text=True, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        times.setdefault(name.strip(), int(cumulative) / 1000)
+    return times
+
+
+for module, heavy in HEAVY_MODULES.items():
+    cwd = "." if module in BUDGETS_MS else "agents_first_project"
+    times = import_times(module, cwd)
+    loaded = [name for name in heavy if name in times]
+    print(f"{module}: {times[module]:.1f} ms")
+    assert not loaded, f"{module} imports {loaded} at startup"
+    if module in BUDGETS_MS:
+        budget = BUDGETS_MS[module] * BUDGET_SCALE
+        assert times[module] <= budget, f"{module} took {times[module]:.1f} ms to import (budget {budget:.0f} ms)"
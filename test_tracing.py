@@ -0,0 +1,33 @@
+import json
+import os
+import tempfile
+from argparse import Namespace
+from google.genai import types
+from main import call_agent
+from tracing import ReplayClient, Tracer, load_trace
+
+
+def recorded(parts):
+    response = types.GenerateContentResponse(
+        candidates=[types.Candidate(content=types.Content(role="model", parts=parts))],
+        usage_metadata=types.GenerateContentResponseUsageMetadata(prompt_token_count=10, candidates_token_count=5),
+    )
+    return {"type": "model_call", "response": response.model_dump(mode="json", exclude_none=True)}
+
+
+records = [
+    {"type": "session", "prompt": "What is in the data directory?"},
+    recorded([types.Part(function_call=types.FunctionCall(name="get_files_info", args={"directory": "data"}))]),
+    recorded([types.Part(text="The data directory holds nifty50_prices.parquet.")]),
+]
+work = tempfile.mkdtemp()
+source = os.path.join(work, "source.jsonl")
+with open(source, "w") as f:
+    f.writelines(json.dumps(r) + "\n" for r in records)
+
+client = ReplayClient(load_trace(source))
+tracer = Tracer(os.path.join(work, "replay.jsonl"))
+print(call_agent(client, Namespace(user_prompt=client.prompt, verbose=False), tracer))
+tracer.close()
+for record in load_trace(tracer.path):
+    print(record["type"], {k: record[k] for k in ("name", "prompt_tokens", "result_bytes", "status") if k in record})
@@ -0,0 +1,33 @@
+import os
+import tempfile
+from functions.write_file import write_file
+from workspace import Snapshot
+
+base = tempfile.mkdtemp()
+os.makedirs(os.path.join(base, "pkg"))
+for name in ("a.txt", "pkg/b.txt", "pkg/c.txt"):
+    with open(os.path.join(base, name), "w") as f:
+        f.write(name)
+
+for method in ("auto", "hardlink", "copy"):
+    snapshot = Snapshot.create(base, method=method)
+    print(snapshot.method, snapshot.changes())
+    print(write_file(snapshot.path, "pkg/b.txt", "changed"))
+    print(write_file(snapshot.path, "new.txt", "new"))
+    os.remove(os.path.join(snapshot.path, "pkg/c.txt"))
+    print(snapshot.changes())
+    print(open(os.path.join(base, "pkg/b.txt")).read())
+    snapshot.discard()
+
+snapshot = Snapshot.create(base)
+write_file(snapshot.path, "a.txt", "committed")
+print(snapshot.commit())
+print(open(os.path.join(base, "a.txt")).read())
+snapshot.discard()
+
+target = tempfile.mkdtemp()
+Snapshot.create(base, target)
+try:
+    Snapshot.create(base, target)
+except FileExistsError as e:
+    print("refused:", e)
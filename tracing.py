@@ -0,0 +1,78 @@
+import json
+import time
+from contextlib import contextmanager
+
+
+class Tracer:
+    """
+    Writes one JSON object per line describing an agent session.
+
+    Records have a "type" of "session", "model_call", "tool_call" or
+    "session_end". Model calls keep the full response so the session can be
+    replayed offline with ReplayClient.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "w")
+        self._start = time.perf_counter()
+
+    def record(self, type, **fields):
+        fields = {"type": type, "t": round(time.perf_counter() - self._start, 6), **fields}
+        self._file.write(json.dumps(fields, default=str) + "\n")
+        self._file.flush()
+
+    @contextmanager
+    def span(self, type, **fields):
+        """Times the body and records it; the body may add fields to the yielded dict."""
+        start = time.perf_counter()
+        try:
+            yield fields
+        finally:
+            fields["duration_s"] = round(time.perf_counter() - start, 6)
+            self.record(type, **fields)
+
+    def close(self):
+        self._file.close()
+
+
+def payload_size(value):
+    """Approximate serialized size in bytes of a message, response or tool result."""
+    if hasattr(value, "model_dump_json"):
+        return len(value.model_dump_json(exclude_none=True))
+    if isinstance(value, (list, tuple)):
+        return sum(payload_size(v) for v in value)
+    return len(str(value))
+
+
+def load_trace(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+class _ReplayModels:
+    def __init__(self, responses):
+        self._responses = iter(responses)
+
+    def generate_content(self, model=None, contents=None, config=None):
+        try:
+            recorded = next(self._responses)
+        except StopIteration:
+            raise RuntimeError("Replay trace has no more recorded model responses")
+        from google.genai import types
+
+        return types.GenerateContentResponse.model_validate(recorded)
+
+
+class ReplayClient:
+    """
+    Stand-in for genai.Client that returns the model responses recorded in a
+    trace, in order. Tool calls still run for real, so replays measure the
+    tool side of a session deterministically and without network access.
+    """
+
+    def __init__(self, records):
+        responses = [r["response"] for r in records if r["type"] == "model_call"]
+        self.models = _ReplayModels(responses)
+        sessions = [r for r in records if r["type"] == "session"]
+        self.prompt = sessions[0]["prompt"] if sessions else None
@@ -0,0 +1,134 @@
+"""
+Copy-on-write snapshots of an agent workspace.
+
+A snapshot is a private tree a session can modify freely; afterwards its
+changes can be listed, committed back to the base tree, or discarded.
+Files are cloned with a reflink where the filesystem supports it (btrfs,
+XFS, APFS-on-Linux...), which shares data blocks until either side writes,
+and copied otherwise.
+
+The "hardlink" method is cheaper still but only safe for tool writes, which
+replace files by rename: a script that rewrites an existing file in place
+(e.g. DataFrame.to_parquet over the same path) would write through to the
+base tree as well.
+"""
+import os
+import shutil
+import tempfile
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+# ioctl request number for FICLONE from <linux/fs.h>.
+FICLONE = 0x40049409
+METHODS = ("auto", "reflink", "hardlink", "copy")
+SKIP_DIRS = {"__pycache__"}
+
+
+def _reflink(src, dst):
+    if fcntl is None:
+        raise OSError("reflinks are not supported on this platform")
+    with open(src, "rb") as s, open(dst, "wb") as d:
+        fcntl.ioctl(d.fileno(), FICLONE, s.fileno())
+    shutil.copystat(src, dst)
+
+
+def _walk_files(root):
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if d not in SKIP_DIRS]
+        for name in filenames:
+            path = os.path.join(dirpath, name)
+            yield os.path.relpath(path, root), path
+
+
+class Snapshot:
+    """A private working copy of `base` at `path`."""
+
+    def __init__(self, base, path, method):
+        self.base = base
+        self.path = path
+        self.method = method
+
+    @classmethod
+    def create(cls, base, path=None, method="auto"):
+        """
+        Clones `base` into `path` (a new temp dir by default), which must not
+        exist yet or be empty.
+
+        "auto" uses reflinks when the first clone succeeds and falls back to
+        plain copies otherwise; the method actually used is kept in
+        `snapshot.method`.
+        """
+        if method not in METHODS:
+            raise ValueError(f"unknown snapshot method {method!r}; expected one of {METHODS}")
+        base = os.path.abspath(base)
+        if path and os.path.exists(path) and (not os.path.isdir(path) or os.listdir(path)):
+            # Cloning into a populated directory would merge two snapshots.
+            raise FileExistsError(f"snapshot path {path!r} already exists and is not empty")
+        path = os.path.abspath(path) if path else tempfile.mkdtemp(prefix="finagent-snapshot-")
+        state = {"method": method}
+
+        def clone(src, dst):
+            if state["method"] in ("auto", "reflink"):
+                try:
+                    _reflink(src, dst)
+                    state["method"] = "reflink"
+                    return dst
+                except OSError:
+                    if state["method"] == "reflink":
+                        raise
+                    if os.path.exists(dst):
+                        os.remove(dst)
+                    state["method"] = "copy"
+            if state["method"] == "hardlink":
+                os.link(src, dst)
+            else:
+                # copy2 keeps mtimes, which changes() relies on.
+                shutil.copy2(src, dst)
+            return dst
+
+        shutil.copytree(base, path, symlinks=True, copy_function=clone, dirs_exist_ok=True,
+                        ignore=shutil.ignore_patterns(*SKIP_DIRS))
+        return cls(base, path, "copy" if state["method"] == "auto" else state["method"])
+
+    def changes(self):
+        """Files added, modified or deleted in the snapshot relative to the base."""
+        added, modified = [], []
+        seen = set()
+        for rel_path, path in _walk_files(self.path):
+            seen.add(rel_path)
+            try:
+                base_st = os.stat(os.path.join(self.base, rel_path))
+            except FileNotFoundError:
+                added.append(rel_path)
+                continue
+            st = os.stat(path)
+            if (st.st_ino, st.st_dev) == (base_st.st_ino, base_st.st_dev):
+                continue  # still the same hard link
+            if (st.st_size, st.st_mtime_ns) != (base_st.st_size, base_st.st_mtime_ns):
+                modified.append(rel_path)
+        deleted = [rel_path for rel_path, _ in _walk_files(self.base) if rel_path not in seen]
+        return {"added": sorted(added), "modified": sorted(modified), "deleted": sorted(deleted)}
+
+    def commit(self):
+        """Applies the snapshot's changes to the base tree and returns them."""
+        changes = self.changes()
+        for rel_path in changes["added"] + changes["modified"]:
+            target = os.path.join(self.base, rel_path)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(target), prefix=".commit-")
+            os.close(fd)
+            try:
+                shutil.copy2(os.path.join(self.path, rel_path), tmp_path)
+                os.replace(tmp_path, target)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        for rel_path in changes["deleted"]:
+            os.remove(os.path.join(self.base, rel_path))
+        return changes
+
+    def discard(self):
+        shutil.rmtree(self.path, ignore_errors=True)